@@ -0,0 +1,108 @@
+import asyncio
+import os
+from collections import deque
+
+# Concurrent LLM streams across all sessions
+MAX_LLM_STREAMS = int(os.getenv("MAX_LLM_STREAMS", "16"))
+# Turns allowed to wait (for their session or an LLM stream) before new chats get 429
+MAX_QUEUED_TURNS = int(os.getenv("MAX_QUEUED_TURNS", "100"))
+# Turns one session may have waiting behind its running turn
+MAX_QUEUED_PER_SESSION = int(os.getenv("MAX_QUEUED_PER_SESSION", "3"))
+
+
+class FairQueue:
+    """
+    FIFO admission with a fixed number of concurrent slots.
+
+    `request()` returns a future that resolves once a slot is granted;
+    every future, granted or not, must be handed back to `release()`.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.active = 0
+        self._waiting: deque[asyncio.Future] = deque()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiting)
+
+    def request(self) -> asyncio.Future:
+        ticket = asyncio.get_running_loop().create_future()
+        if self.active < self.capacity and not self._waiting:
+            self.active += 1
+            ticket.set_result(None)
+        else:
+            self._waiting.append(ticket)
+        return ticket
+
+    def position(self, ticket: asyncio.Future) -> int:
+        """1-based place in line, or 0 once the slot is granted."""
+        if ticket.done():
+            return 0
+        return self._waiting.index(ticket) + 1
+
+    def release(self, ticket: asyncio.Future):
+        if not ticket.done():
+            # Gave up while waiting, e.g. the client disconnected
+            self._waiting.remove(ticket)
+            ticket.cancel()
+            return
+
+        self.active -= 1
+        if self._waiting and self.active < self.capacity:
+            self.active += 1
+            self._waiting.popleft().set_result(None)
+
+
+class SessionTurns:
+    """One turn at a time per session, in arrival order."""
+
+    def __init__(self):
+        self._queues: dict[str, FairQueue] = {}
+
+    @property
+    def waiting(self) -> int:
+        return sum(queue.waiting for queue in self._queues.values())
+
+    def waiting_for(self, session_id: str) -> int:
+        queue = self._queues.get(session_id)
+        return queue.waiting if queue else 0
+
+    def request(self, session_id: str) -> asyncio.Future:
+        queue = self._queues.setdefault(session_id, FairQueue(1))
+        return queue.request()
+
+    def position(self, session_id: str, ticket: asyncio.Future) -> int:
+        return self._queues[session_id].position(ticket)
+
+    def release(self, session_id: str, ticket: asyncio.Future):
+        queue = self._queues[session_id]
+        queue.release(ticket)
+        if queue.active == 0 and not queue.waiting:
+            del self._queues[session_id]
+
+
+# Each session has at most one turn waiting for a stream, so the FIFO
+# order of `llm_streams` is round-robin across sessions: a turn that needs
+# another round re-queues behind every other session already waiting.
+session_turns = SessionTurns()
+llm_streams = FairQueue(MAX_LLM_STREAMS)
+
+
+def overloaded(session_id: str) -> bool:
+    """Whether a new turn should be refused instead of queued."""
+    return (
+        session_turns.waiting + llm_streams.waiting >= MAX_QUEUED_TURNS
+        or session_turns.waiting_for(session_id) >= MAX_QUEUED_PER_SESSION
+    )
+
+
+def stats() -> dict:
+    return {
+        "llm_streams_active": llm_streams.active,
+        "llm_streams_max": llm_streams.capacity,
+        "waiting_for_stream": llm_streams.waiting,
+        "waiting_for_session": session_turns.waiting,
+        "max_queued_turns": MAX_QUEUED_TURNS
+    }
@@ -0,0 +1,60 @@
+import hashlib
+import os
+import re
+from collections import OrderedDict
+
+CHART_STORE_MB = float(os.getenv("CHART_STORE_MB", "128"))
+# Shape of the names `put` hands out
+DIGEST_PATTERN = re.compile(r"[0-9a-f]{32}")
+
+
+class ChartStore:
+    """
+    Content-addressed store for rendered chart images.
+
+    A chart is named by the hash of its bytes, so an identical chart is
+    stored once and its URL never changes meaning. Least recently used
+    charts are evicted once the store exceeds its memory limit. The store
+    lives in this process only, so a URL stays valid until its chart is
+    evicted or the backend restarts.
+    """
+
+    def __init__(self, max_bytes: int = int(CHART_STORE_MB * 1024 * 1024)):
+        self.max_bytes = max_bytes
+        self._charts: OrderedDict[str, tuple[bytes, str]] = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.evicted = 0
+
+    def put(self, data: bytes, media_type: str = "image/png") -> str:
+        digest = hashlib.sha256(data).hexdigest()[:32]
+        if digest in self._charts:
+            self._charts.move_to_end(digest)
+            self.hits += 1
+            return digest
+
+        self._charts[digest] = (data, media_type)
+        self.total_bytes += len(data)
+        while self.total_bytes > self.max_bytes and len(self._charts) > 1:
+            _, (evicted, _) = self._charts.popitem(last=False)
+            self.total_bytes -= len(evicted)
+            self.evicted += 1
+        return digest
+
+    def get(self, digest: str) -> tuple[bytes, str] | None:
+        chart = self._charts.get(digest)
+        if chart is not None:
+            self._charts.move_to_end(digest)
+        return chart
+
+    def stats(self) -> dict:
+        return {
+            "charts": len(self._charts),
+            "total_bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "duplicate_puts": self.hits,
+            "evicted": self.evicted
+        }
+
+
+chart_store = ChartStore()
@@ -0,0 +1,86 @@
+import importlib
+import logging
+import sys
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+def _local_module_names(directory: Path) -> set:
+    """Top-level modules and packages that live in a server's directory."""
+    return {
+        path.stem
+        for path in directory.iterdir()
+        if path.suffix == ".py" or (path / "__init__.py").exists()
+    }
+
+
+def load_server(directory: Path):
+    """
+    Import a server's main.py and return its FastMCP instance.
+
+    Every server imports sibling modules by bare name (`tools`, `utils`,
+    `logger`), so each one is imported in isolation: colliding entries
+    are moved out of `sys.modules` for the import and put back afterwards.
+    The loaded functions keep their own module globals, so several
+    servers can live side by side in one process.
+    """
+    local = _local_module_names(directory)
+
+    def is_local(module_name: str) -> bool:
+        return module_name.split(".")[0] in local
+
+    saved = {name: sys.modules.pop(name) for name in list(sys.modules) if is_local(name)}
+    sys.path.insert(0, str(directory))
+    try:
+        module = importlib.import_module("main")
+    finally:
+        sys.path[:] = [p for p in sys.path if p != str(directory)]
+        for name in [name for name in sys.modules if is_local(name)]:
+            del sys.modules[name]
+        sys.modules.update(saved)
+
+    return module.mcp
+
+
+class InProcessServer:
+    """
+    An MCP server mounted inside the backend process.
+
+    Calls go through FastMCP's in-memory transport, so tool names, schemas
+    and result shapes are identical to the remote deployment, without any
+    network hop.
+    """
+
+    def __init__(self, server_name: str, directory: Path):
+        self.server_name = server_name
+        self.directory = directory
+        self.client = None
+        self.calls = 0
+
+    async def start(self):
+        from fastmcp import Client
+
+        self.client = Client(load_server(self.directory))
+        await self.client.__aenter__()
+        logger.info(f"Mounted MCP server '{self.server_name}' in-process")
+
+    async def get_tools(self) -> list:
+        from langchain_mcp_adapters.tools import load_mcp_tools
+
+        return await load_mcp_tools(self.client.session, server_name=self.server_name)
+
+    async def call_tool(self, tool_name: str, arguments: dict, progress_callback=None):
+        self.calls += 1
+        return await self.client.call_tool_mcp(
+            tool_name,
+            arguments,
+            progress_handler=progress_callback
+        )
+
+    async def close(self):
+        if self.client is not None:
+            await self.client.__aexit__(None, None, None)
+
+    def stats(self) -> dict:
+        return {"transport": "in_process", "calls": self.calls}
@@ -0,0 +1,67 @@
+import logging
+import os
+import httpx
+from langchain_openai import ChatOpenAI
+
+logger = logging.getLogger(__name__)
+
+LLM_MODEL = os.getenv("LLM_MODEL", "gpt-4o")
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "100"))
+LLM_MAX_KEEPALIVE = int(os.getenv("LLM_MAX_KEEPALIVE", "20"))
+
+# One pooled HTTP client for every LLM request, so concurrent chats reuse
+# warm keep-alive connections instead of paying a TLS handshake each time.
+http_client = httpx.AsyncClient(
+    limits=httpx.Limits(
+        max_connections=LLM_MAX_CONNECTIONS,
+        max_keepalive_connections=LLM_MAX_KEEPALIVE,
+        keepalive_expiry=60
+    ),
+    timeout=httpx.Timeout(120, connect=10)
+)
+
+_base_llm: ChatOpenAI | None = None
+_bound_llm = None
+_bound_tools: tuple = ()
+
+
+def _get_base_llm() -> ChatOpenAI:
+    global _base_llm
+    if _base_llm is None:
+        _base_llm = ChatOpenAI(
+            model=LLM_MODEL,
+            temperature=0,
+            streaming=True,
+            http_async_client=http_client
+        )
+    return _base_llm
+
+
+def get_llm(tools: list):
+    """
+    Return the shared streaming model bound to `tools`.
+
+    Tool schemas are serialized once by `bind_tools`; the bound model is
+    only rebuilt when the set of tool names changes.
+    """
+    global _bound_llm, _bound_tools
+
+    names = tuple(tool.name for tool in tools)
+    if _bound_llm is None or names != _bound_tools:
+        llm = _get_base_llm()
+        _bound_llm = llm.bind_tools(tools) if tools else llm
+        _bound_tools = names
+    return _bound_llm
+
+
+async def warm_up():
+    """Open a pooled connection to the LLM API before the first chat arrives."""
+    try:
+        await _get_base_llm().root_async_client.models.list()
+    except Exception as e:
+        # A failed warm-up only costs the first request its handshake.
+        logger.warning(f"LLM warm-up failed: {e}")
+
+
+async def close():
+    await http_client.aclose()
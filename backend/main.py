@@ -1,11 +1,12 @@
+import asyncio
+import base64
 import json
 import os
-from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from contextlib import aclosing, asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware  
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import (
     HumanMessage,
     AIMessage,
@@ -13,8 +14,22 @@ from langchain_core.messages import (
     AIMessageChunk
 )
 
-from mcp_client import client
+import mcp_client
+from mcp_client import call_tool, progress_sink
+import llm_client
+from sse import sse_response
+import admission
+from admission import session_turns, llm_streams
+from chart_store import chart_store, DIGEST_PATTERN
+from tool_cache import tool_cache, cache_key, is_pure
+from result_store import (
+    result_store,
+    fetch_tool_result_tool,
+    offload_large_result,
+    resolve_refs
+)
 from session_memory import (
+    session_store,
     get_session_history,
     append_to_session,
     clear_session
@@ -22,16 +37,45 @@ from session_memory import (
 
 tools_cache = []
 named_tools_cache = {}
+tool_servers = {}  # tool name -> MCP server name
+
+# Tools served by the orchestrator itself rather than an MCP server
+LOCAL_TOOLS = {fetch_tool_result_tool.name: fetch_tool_result_tool}
+
+# Max tool calls from one LLM round that run at the same time
+MAX_CONCURRENT_TOOLS = int(os.getenv("MAX_CONCURRENT_TOOLS", "4"))
+
+# How often a queued request is told its position
+QUEUE_UPDATE_SECONDS = 1.0
+RETRY_AFTER_SECONDS = 2
+# Replaces a chart tool's output in the history once the chart is shown
+CHART_DISPLAYED = json.dumps({
+    "status": "success",
+    "note": "Chart image has already been rendered and displayed to the user inline. Do NOT output any base64 data, markdown image links, or image URLs. Simply refer to the chart as 'the chart above' or 'the chart shown'."
+})
 
 
 @asynccontextmanager
 async def lifespan(app):
-    """Load MCP tools on startup."""
-    global tools_cache, named_tools_cache
+    """Load MCP tools, open pooled sessions and warm up the LLM on startup."""
+    global tools_cache, named_tools_cache, tool_servers
 
-    tools_cache = await client.get_tools()
+    await mcp_client.start()
+    server_tools = await mcp_client.load_tools()
+    tools_cache = [tool for tools in server_tools.values() for tool in tools]
+    tools_cache += LOCAL_TOOLS.values()
     named_tools_cache = {tool.name: tool for tool in tools_cache}
+    tool_servers = {
+        tool.name: name
+        for name, tools in server_tools.items()
+        for tool in tools
+    }
+
+    llm_client.get_llm(tools_cache)
+    await llm_client.warm_up()
     yield
+    await mcp_client.close()
+    await llm_client.close()
 
 
 app = FastAPI(title="Financial Orchestrator AI", lifespan=lifespan)
@@ -51,7 +95,179 @@ class ChatRequest(BaseModel):
     message: str
 
 
+async def call_mcp_tool(tool_name: str, tool_args: dict):
+    """Run one MCP tool and return (ToolMessage content, parsed JSON or None)."""
+    tool_output_parsed = None
+    try:
+        result = await call_tool(tool_servers[tool_name], tool_name, tool_args)
+
+        # MCP tools return a list of content blocks:
+        # [TextContent(type="text", text='{"image_base64": "..."}')]
+        # We need to extract the text and parse it.
+        raw_text = next(
+            (block.text for block in result.content if block.type == "text"),
+            None
+        )
+
+        if result.isError:
+            tool_result_content = json.dumps({"error": raw_text or "Tool call failed"})
+        elif raw_text:
+            # Try to parse as JSON dict
+            tool_result_content = raw_text
+            try:
+                tool_output_parsed = json.loads(raw_text)
+            except (json.JSONDecodeError, TypeError):
+                tool_output_parsed = None
+        else:
+            tool_result_content = str(result.content)
+    except Exception as e:
+        tool_result_content = json.dumps({"error": str(e)})
+
+    return tool_result_content, tool_output_parsed
+
+
+def is_successful(result) -> bool:
+    """Only successful tool results are worth caching."""
+    _, parsed = result
+    return (
+        isinstance(parsed, dict)
+        and parsed.get("success") is not False
+        and "error" not in parsed
+    )
+
+
+async def invoke_tool(tool_name: str, tool_args: dict):
+    """Run a tool call, serving pure tools from the shared result cache."""
+    tool = named_tools_cache.get(tool_name)
+    if tool is None:
+        return json.dumps({"error": "Tool not found"}), None
+
+    if tool_name in LOCAL_TOOLS:
+        # Bad arguments go back to the model as a tool error, not abort the turn
+        try:
+            return await tool.ainvoke(tool_args), None
+        except Exception as e:
+            return json.dumps({"error": str(e)}), None
+
+    # Large results earlier in the chat are passed back by ref
+    try:
+        tool_args = resolve_refs(tool_args)
+    except KeyError as e:
+        return json.dumps({"error": e.args[0]}), None
+
+    if is_pure(tool):
+        return await tool_cache.get_or_call(
+            cache_key(tool_name, tool_args),
+            lambda: call_mcp_tool(tool_name, tool_args),
+            should_store=is_successful
+        )
+    return await call_mcp_tool(tool_name, tool_args)
+
+
+def progress_event(tool_name: str, progress, total, message):
+    """Build a 'progress' SSE payload from an MCP progress notification."""
+    try:
+        content = json.loads(message) if message else None
+    except (json.JSONDecodeError, TypeError):
+        content = message
+    return {
+        "type": "progress",
+        "tool": tool_name,
+        "progress": progress,
+        "total": total,
+        "content": content
+    }
+
+
+async def drain_events(events: asyncio.Queue, pending: asyncio.Future):
+    """Yield queued SSE payloads until `pending` finishes, then flush the rest."""
+    while True:
+        getter = asyncio.ensure_future(events.get())
+        done, _ = await asyncio.wait(
+            {getter, pending},
+            return_when=asyncio.FIRST_COMPLETED
+        )
+        if getter in done:
+            yield getter.result()
+            continue
+
+        getter.cancel()
+        while not events.empty():
+            yield events.get_nowait()
+        return
+
+
+async def run_tool_call(
+    tc: dict,
+    events: asyncio.Queue,
+    semaphore: asyncio.Semaphore
+) -> ToolMessage:
+    """Execute one tool call, pushing its SSE events onto `events`."""
+    tool_name = tc["name"]
+    tool_args = tc.get("args", {})
+
+    async with semaphore:
+        events.put_nowait({"type": "tool_start", "tool": tool_name})
+
+        def on_progress(progress, total, message):
+            events.put_nowait(progress_event(tool_name, progress, total, message))
+
+        # Each task runs in its own context copy, so progress notifications
+        # from this call's MCP session reach this call's `on_progress`.
+        progress_sink.set(on_progress)
+        tool_result_content, tool_output_parsed = await invoke_tool(tool_name, tool_args)
+
+        # If the tool returned a chart image, store it and send its URL
+        # in a dedicated 'chart' event so the frontend renders it as
+        # an <img> immediately — NOT as streaming text tokens.
+        if isinstance(tool_output_parsed, dict) and "image_base64" in tool_output_parsed:
+            digest = chart_store.put(
+                base64.b64decode(tool_output_parsed["image_base64"]),
+                tool_output_parsed.get("media_type", "image/png")
+            )
+            events.put_nowait({"type": "chart", "src": f"/charts/{digest}"})
+            # Tell GPT-4o the chart is already displayed.
+            tool_result_content = CHART_DISPLAYED
+        elif isinstance(tool_output_parsed, dict) and "chart_spec" in tool_output_parsed:
+            # A JSON chart description: the frontend draws it itself.
+            events.put_nowait({"type": "chart_spec", "spec": tool_output_parsed["chart_spec"]})
+            tool_result_content = CHART_DISPLAYED
+        else:
+            # Only a digest of large results goes into the history
+            tool_result_content = offload_large_result(tool_result_content, tool_output_parsed)
+
+        events.put_nowait({"type": "tool_end", "tool": tool_name})
+
+    return ToolMessage(
+        tool_call_id=tc["id"],
+        content=tool_result_content
+    )
+
+
+async def wait_in_queue(ticket: asyncio.Future, position, scope: str):
+    """Yield 'queued' events with the current position until `ticket` is granted."""
+    while not ticket.done():
+        yield {"type": "queued", "scope": scope, "position": position()}
+        await asyncio.wait({ticket}, timeout=QUEUE_UPDATE_SECONDS)
+
+
 async def event_generator(session_id: str, user_input: str):
+    # Turns of one session run one at a time, so their messages never interleave
+    turn = session_turns.request(session_id)
+    try:
+        async for event in wait_in_queue(
+            turn, lambda: session_turns.position(session_id, turn), "session"
+        ):
+            yield event
+        # aclosing: a client disconnect must release run_turn's stream slot now
+        async with aclosing(run_turn(session_id, user_input)) as events:
+            async for event in events:
+                yield event
+    finally:
+        session_turns.release(session_id, turn)
+
+
+async def run_turn(session_id: str, user_input: str):
     MAX_TOOL_ROUNDS = 5  # Safety limit to prevent infinite loops
 
     try:
@@ -59,15 +275,8 @@ async def event_generator(session_id: str, user_input: str):
         user_msg = HumanMessage(content=user_input)
         append_to_session(session_id, user_msg)
 
-        # 2️⃣ Setup LLM
-        llm = ChatOpenAI(
-            model="gpt-4o",
-            temperature=0,
-            streaming=True
-        )
-
-        if tools_cache:
-            llm = llm.bind_tools(tools_cache)
+        # 2️⃣ Shared LLM, bound to the current tool set
+        llm = llm_client.get_llm(tools_cache)
 
         # 3️⃣ Agent Loop — keep going until GPT-4o stops calling tools
         for round_num in range(MAX_TOOL_ROUNDS):
@@ -75,11 +284,20 @@ async def event_generator(session_id: str, user_input: str):
             history = get_session_history(session_id)
             accumulated = AIMessageChunk(content="")
 
-            # Stream LLM response
-            async for chunk in llm.astream(history):
-                accumulated += chunk
-                if chunk.content:
-                    yield f"data: {json.dumps({'type': 'token', 'content': chunk.content})}\n\n"
+            # Stream LLM response once a stream slot is free; the slot is
+            # released during tool calls so other sessions can use it.
+            stream = llm_streams.request()
+            try:
+                async for event in wait_in_queue(
+                    stream, lambda: llm_streams.position(stream), "server"
+                ):
+                    yield event
+                async for chunk in llm.astream(history):
+                    accumulated += chunk
+                    if chunk.content:
+                        yield {"type": "token", "content": chunk.content}
+            finally:
+                llm_streams.release(stream)
 
             # Save AI message to session
             ai_message = AIMessage(
@@ -93,86 +311,115 @@ async def event_generator(session_id: str, user_input: str):
                 break
 
             # 4️⃣ Execute tool calls
-            yield f"data: {json.dumps({'type': 'status', 'content': 'Using financial tools...'})}\n\n"
-
-            for tc in accumulated.tool_calls:
-                tool_name = tc["name"]
-                tool_args = tc.get("args", {})
-                tool_id = tc["id"]
-
-                yield f"data: {json.dumps({'type': 'tool_start', 'tool': tool_name})}\n\n"
-
-                tool_output = None
-                tool_output_parsed = None
-                try:
-                    if tool_name in named_tools_cache:
-                        tool_output = await named_tools_cache[tool_name].ainvoke(tool_args)
-
-                        # MCP tools return a list of content blocks:
-                        # [{"type": "text", "text": '{"image_base64": "..."}'}]
-                        # We need to extract the text and parse it.
-                        raw_text = None
-                        if isinstance(tool_output, list) and len(tool_output) > 0:
-                            first = tool_output[0]
-                            if isinstance(first, dict) and "text" in first:
-                                raw_text = first["text"]
-                            elif isinstance(first, str):
-                                raw_text = first
-                        elif isinstance(tool_output, dict):
-                            raw_text = json.dumps(tool_output)
-                        elif isinstance(tool_output, str):
-                            raw_text = tool_output
-
-                        # Try to parse as JSON dict
-                        if raw_text:
-                            tool_result_content = raw_text
-                            try:
-                                tool_output_parsed = json.loads(raw_text)
-                            except (json.JSONDecodeError, TypeError):
-                                tool_output_parsed = None
-                        else:
-                            tool_result_content = str(tool_output)
-                    else:
-                        tool_result_content = json.dumps({"error": "Tool not found"})
-                except Exception as e:
-                    tool_result_content = json.dumps({"error": str(e)})
-
-                # If the tool returned a chart image, send it as a
-                # dedicated 'chart' event so the frontend renders it as
-                # an <img> immediately — NOT as streaming text tokens.
-                if isinstance(tool_output_parsed, dict) and "image_base64" in tool_output_parsed:
-                    b64 = tool_output_parsed["image_base64"]
-                    yield f"data: {json.dumps({'type': 'chart', 'src': f'data:image/png;base64,{b64}'})}\n\n"
-                    # Tell GPT-4o the chart is already displayed.
-                    tool_result_content = json.dumps({
-                        "status": "success",
-                        "note": "Chart image has already been rendered and displayed to the user inline. Do NOT output any base64 data, markdown image links, or image URLs. Simply refer to the chart as 'the chart above' or 'the chart shown'."
-                    })
-
-                tool_msg = ToolMessage(
-                    tool_call_id=tool_id,
-                    content=tool_result_content
-                )
+            yield {"type": "status", "content": "Using financial tools..."}
+
+            # Independent calls run concurrently; events stream as each
+            # call starts and finishes, while ToolMessages are appended in
+            # the original call order so the history stays valid.
+            events = asyncio.Queue()
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_TOOLS)
+            tasks = [
+                asyncio.create_task(run_tool_call(tc, events, semaphore))
+                for tc in accumulated.tool_calls
+            ]
+            round_results = asyncio.gather(*tasks)
+
+            try:
+                async for event in drain_events(events, round_results):
+                    yield event
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+            for tool_msg in round_results.result():
                 append_to_session(session_id, tool_msg)
 
-                yield f"data: {json.dumps({'type': 'tool_end', 'tool': tool_name})}\n\n"
-
             # Loop continues — GPT-4o will see tool results and may call more tools
 
-        yield f"data: {json.dumps({'type': 'done'})}\n\n"
+        yield {"type": "done"}
 
     except Exception as e:
-        yield f"data: {json.dumps({'type': 'error', 'content': str(e)})}\n\n"
+        yield {"type": "error", "content": str(e)}
 
 
 @app.post("/chat")
-async def chat(request: ChatRequest):
-    return StreamingResponse(
+async def chat(request: ChatRequest, http_request: Request):
+    if admission.overloaded(request.session_id):
+        return JSONResponse(
+            status_code=429,
+            content={"error": "Too many requests in progress. Please retry shortly."},
+            headers={"Retry-After": str(RETRY_AFTER_SECONDS)}
+        )
+    return sse_response(
         event_generator(request.session_id, request.message),
-        media_type="text/event-stream"
+        http_request.headers.get("accept-encoding", "")
     )
 
 
+@app.get("/charts/{digest}")
+async def get_chart(digest: str, http_request: Request):
+    """
+    Serve a stored chart. Its URL is its content hash, so it never changes.
+
+    A well-formed hash that is no longer stored was issued earlier and has
+    since been evicted or lost in a restart: 410, so clients can tell an
+    expired chart from a bad URL.
+    """
+    chart = chart_store.get(digest)
+    if chart is None:
+        if DIGEST_PATTERN.fullmatch(digest):
+            raise HTTPException(
+                status_code=410,
+                detail="Chart expired: it is no longer held by this server. Ask for the chart again to re-render it."
+            )
+        raise HTTPException(status_code=404, detail="Chart not found")
+
+    data, media_type = chart
+    headers = {
+        "ETag": f'"{digest}"',
+        "Cache-Control": "public, max-age=31536000, immutable"
+    }
+    if http_request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=data, media_type=media_type, headers=headers)
+
+
+@app.get("/chart-store/stats")
+async def chart_store_stats():
+    """Charts and memory held by the chart store."""
+    return chart_store.stats()
+
+
+@app.get("/admission/stats")
+async def admission_stats():
+    """Active LLM streams and queued turns."""
+    return admission.stats()
+
+
+@app.get("/tool-cache/stats")
+async def tool_cache_stats():
+    """Hit/miss counters for sizing the tool-result cache."""
+    return tool_cache.stats()
+
+
+@app.get("/tool-results/stats")
+async def tool_result_stats():
+    """Entries and memory held by the out-of-band tool result store."""
+    return result_store.stats()
+
+
+@app.get("/mcp-sessions/stats")
+async def mcp_session_stats():
+    """Idle sessions, opens and reconnects (or in-process calls) per MCP server."""
+    return mcp_client.stats()
+
+
+@app.get("/sessions/stats")
+async def session_stats(top: int = 20):
+    """Total and per-session memory use of the session store."""
+    return session_store.stats(top)
+
+
 @app.delete("/clear-session/{session_id}")
 async def clear_session_endpoint(session_id: str):
     """Reset a session's history — useful when history gets corrupted."""
@@ -1,6 +1,11 @@
+import asyncio
 import os
+from contextvars import ContextVar
+from pathlib import Path
 from dotenv import load_dotenv
 from langchain_mcp_adapters.client import MultiServerMCPClient
+from in_process import InProcessServer
+from mcp_pool import MCPSessionPool
 
 load_dotenv()
 
@@ -8,6 +13,13 @@ load_dotenv()
 # Set FASTMCP_API_KEY in your .env file
 FASTMCP_API_KEY = os.getenv("FASTMCP_API_KEY", "")
 
+# Long-lived sessions kept per server, and how often idle ones are pinged
+MCP_SESSIONS_PER_SERVER = int(os.getenv("MCP_SESSIONS_PER_SERVER", "4"))
+MCP_PING_INTERVAL = float(os.getenv("MCP_PING_INTERVAL", "30"))
+MCP_CALL_TIMEOUT = float(os.getenv("MCP_CALL_TIMEOUT", "120"))
+# Seconds a call may wait for a free session before failing
+MCP_ACQUIRE_TIMEOUT = float(os.getenv("MCP_ACQUIRE_TIMEOUT", "60"))
+
 AUTH_HEADERS = {
     "Authorization": f"Bearer {FASTMCP_API_KEY}"
 } if FASTMCP_API_KEY else {}
@@ -35,5 +47,112 @@ SERVERS = {
     }
 }
 
-# Module-level client instance — used in FastAPI lifespan
-client = MultiServerMCPClient(SERVERS)
+MCP_SERVERS_DIR = Path(__file__).resolve().parent.parent / "mcp_servers"
+SERVER_DIRS = {
+    "math": MCP_SERVERS_DIR / "math_server",
+    "investment": MCP_SERVERS_DIR / "investment_server",
+    "expense": MCP_SERVERS_DIR / "expense_server",
+    "chart": MCP_SERVERS_DIR / "chart_server",
+}
+
+# Servers to mount inside the backend process instead of reaching them
+# over HTTP, e.g. MCP_IN_PROCESS=math,investment,expense,chart.
+# Requires each server's dependencies in the backend environment.
+MCP_IN_PROCESS = {
+    name.strip()
+    for name in os.getenv("MCP_IN_PROCESS", "").split(",")
+    if name.strip()
+}
+_unknown_servers = MCP_IN_PROCESS - SERVER_DIRS.keys()
+if _unknown_servers:
+    raise ValueError(
+        f"MCP_IN_PROCESS has unknown server(s) {', '.join(sorted(_unknown_servers))}; "
+        f"valid names are {', '.join(SERVER_DIRS)}."
+    )
+
+REMOTE_SERVERS = {
+    name: connection
+    for name, connection in SERVERS.items()
+    if name not in MCP_IN_PROCESS
+}
+
+# Per-tool-call receiver for MCP progress notifications.
+# The orchestrator sets this before invoking a tool; `call_tool` picks it
+# up and forwards that call's notifications to it.
+progress_sink: ContextVar = ContextVar("progress_sink", default=None)
+
+# Used at startup to discover remote tools and their schemas
+client = MultiServerMCPClient(REMOTE_SERVERS)
+
+# Used for every remote tool call: one initialize handshake per session,
+# not per call
+session_pool = MCPSessionPool(
+    REMOTE_SERVERS,
+    max_sessions=MCP_SESSIONS_PER_SERVER,
+    ping_interval=MCP_PING_INTERVAL,
+    call_timeout=MCP_CALL_TIMEOUT,
+    acquire_timeout=MCP_ACQUIRE_TIMEOUT
+)
+
+
+local_servers = {
+    name: InProcessServer(name, SERVER_DIRS[name])
+    for name in MCP_IN_PROCESS
+}
+
+
+async def start():
+    for server in local_servers.values():
+        await server.start()
+    await session_pool.start()
+
+
+async def close():
+    await session_pool.close()
+    for server in local_servers.values():
+        await server.close()
+
+
+async def load_tools() -> dict:
+    """Discover tools per server: {server name: [LangChain tools]}."""
+    names = list(SERVERS)
+
+    async def tools_for(name):
+        if name in local_servers:
+            return await local_servers[name].get_tools()
+        return await client.get_tools(server_name=name)
+
+    return dict(zip(names, await asyncio.gather(*(tools_for(name) for name in names))))
+
+
+def stats() -> dict:
+    return {
+        **session_pool.stats(),
+        **{name: server.stats() for name, server in local_servers.items()}
+    }
+
+
+async def call_tool(server_name: str, tool_name: str, arguments: dict):
+    """
+    Call a tool in-process or over a pooled session, relaying progress
+    notifications to `progress_sink`.
+    """
+    sink = progress_sink.get()
+    progress_callback = None
+    if sink is not None:
+        async def progress_callback(progress, total, message):
+            sink(progress, total, message)
+
+    if server_name in local_servers:
+        return await local_servers[server_name].call_tool(
+            tool_name,
+            arguments,
+            progress_callback=progress_callback
+        )
+
+    return await session_pool.call_tool(
+        server_name,
+        tool_name,
+        arguments,
+        progress_callback=progress_callback
+    )
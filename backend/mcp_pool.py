@@ -0,0 +1,248 @@
+import asyncio
+import logging
+from datetime import timedelta
+import anyio
+import httpx
+from langchain_mcp_adapters.sessions import create_session
+from mcp.shared.exceptions import McpError
+from mcp.types import CONNECTION_CLOSED
+
+logger = logging.getLogger(__name__)
+
+# MCP reports request timeouts as an McpError with HTTP 408
+_TIMEOUT_CODE = 408
+
+
+def _is_timeout(error: Exception) -> bool:
+    return isinstance(error, McpError) and error.error.code == _TIMEOUT_CODE
+
+
+# Raised when the session's connection is gone, not by the server
+_TRANSPORT_ERRORS = (
+    OSError,
+    httpx.TransportError,
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    anyio.EndOfStream,
+)
+
+
+def _is_transport_error(error: Exception) -> bool:
+    return isinstance(error, _TRANSPORT_ERRORS) or (
+        isinstance(error, McpError) and error.error.code == CONNECTION_CLOSED
+    )
+
+
+class PooledSession:
+    """
+    One long-lived MCP session.
+
+    MCP sessions are async context managers backed by task groups, which
+    must be entered and exited in the same task, so each session is owned
+    by a dedicated background task that stays alive until `close()`.
+    """
+
+    def __init__(self, server_name: str, connection: dict):
+        self.server_name = server_name
+        self.connection = connection
+        self.session = None
+        self._ready = asyncio.Event()
+        self._closing = asyncio.Event()
+        self._error: BaseException | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def healthy(self) -> bool:
+        return self.session is not None and not self._task.done()
+
+    async def open(self, timeout: float):
+        self._task = asyncio.create_task(self._run())
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+            raise ConnectionError(f"Timed out connecting to MCP server '{self.server_name}'")
+        if self._error is not None:
+            raise self._error
+
+    async def _run(self):
+        try:
+            async with create_session(self.connection) as session:
+                await session.initialize()
+                self.session = session
+                self._ready.set()
+                await self._closing.wait()
+        except Exception as e:
+            if not self._ready.is_set():
+                self._error = e
+            else:
+                logger.warning(f"MCP session to '{self.server_name}' dropped: {e}")
+        finally:
+            self.session = None
+            self._ready.set()
+
+    async def close(self):
+        self._closing.set()
+        if self._task is not None:
+            try:
+                await asyncio.wait_for(self._task, timeout=5)
+            except (asyncio.TimeoutError, Exception):
+                self._task.cancel()
+
+
+class ServerSessionPool:
+    """Bounded pool of reusable MCP sessions for one server."""
+
+    def __init__(self, server_name: str, connection: dict, max_sessions: int,
+                 call_timeout: float, connect_timeout: float, acquire_timeout: float):
+        self.server_name = server_name
+        self.connection = connection
+        self.max_sessions = max_sessions
+        self.call_timeout = timedelta(seconds=call_timeout)
+        self.connect_timeout = connect_timeout
+        self.acquire_timeout = acquire_timeout
+        self._idle: list[PooledSession] = []
+        self._slots = asyncio.Semaphore(max_sessions)
+        self.opened = 0
+        self.reconnects = 0
+
+    async def _acquire(self) -> PooledSession:
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.acquire_timeout)
+        except asyncio.TimeoutError:
+            raise ConnectionError(
+                f"No free MCP session to '{self.server_name}' after {self.acquire_timeout:g}s"
+            )
+        try:
+            while self._idle:
+                pooled = self._idle.pop()
+                if pooled.healthy:
+                    return pooled
+                await pooled.close()
+
+            pooled = PooledSession(self.server_name, self.connection)
+            await pooled.open(self.connect_timeout)
+            self.opened += 1
+            return pooled
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _release(self, pooled: PooledSession, broken: bool = False):
+        if broken or not pooled.healthy:
+            asyncio.ensure_future(pooled.close())
+        else:
+            self._idle.append(pooled)
+        self._slots.release()
+
+    async def call_tool(self, tool_name: str, arguments: dict, progress_callback=None):
+        """
+        Call a tool on a pooled session.
+
+        A transport failure (the connection dropped or was closed)
+        discards the session and retries once on a fresh one, so a server
+        restart costs one reconnect, not an error. Errors the server
+        answers with, such as an unknown tool or invalid params, are
+        raised as-is and keep the session. Timeouts are not retried. A
+        cancelled call (e.g. the client disconnected) still returns its
+        slot, but not its session, whose stream may hold a half-read
+        response.
+        """
+        for attempt in range(2):
+            pooled = await self._acquire()
+            broken = True
+            try:
+                result = await pooled.session.call_tool(
+                    tool_name,
+                    arguments,
+                    read_timeout_seconds=self.call_timeout,
+                    progress_callback=progress_callback
+                )
+                broken = False
+            except Exception as e:
+                if isinstance(e, McpError) and not (_is_timeout(e) or _is_transport_error(e)):
+                    broken = False
+                    raise
+                if attempt == 1 or not _is_transport_error(e):
+                    raise
+                self.reconnects += 1
+                continue
+            finally:
+                self._release(pooled, broken)
+            return result
+
+    async def warm(self):
+        """Open one session ahead of the first call."""
+        pooled = await self._acquire()
+        self._release(pooled)
+
+    async def ping_idle(self, timeout: float):
+        """Ping idle sessions; drop any that fail so the next call reconnects."""
+        for pooled in list(self._idle):
+            try:
+                await asyncio.wait_for(pooled.session.send_ping(), timeout)
+            except Exception:
+                if pooled in self._idle:
+                    self._idle.remove(pooled)
+                    await pooled.close()
+
+    async def close(self):
+        idle, self._idle = self._idle, []
+        await asyncio.gather(*(pooled.close() for pooled in idle))
+
+    def stats(self) -> dict:
+        return {
+            "idle": len(self._idle),
+            "max_sessions": self.max_sessions,
+            "opened": self.opened,
+            "reconnects": self.reconnects
+        }
+
+
+class MCPSessionPool:
+    """Persistent, pooled MCP sessions for every configured server."""
+
+    def __init__(self, servers: dict, max_sessions: int, ping_interval: float,
+                 call_timeout: float = 120, connect_timeout: float = 15,
+                 acquire_timeout: float = 60):
+        self.pools = {
+            name: ServerSessionPool(
+                name, connection, max_sessions, call_timeout, connect_timeout,
+                acquire_timeout
+            )
+            for name, connection in servers.items()
+        }
+        self.ping_interval = ping_interval
+        self._pinger: asyncio.Task | None = None
+
+    async def start(self):
+        results = await asyncio.gather(
+            *(pool.warm() for pool in self.pools.values()),
+            return_exceptions=True
+        )
+        for name, result in zip(self.pools, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Could not pre-open MCP session to '{name}': {result}")
+        self._pinger = asyncio.create_task(self._keep_alive())
+
+    async def _keep_alive(self):
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            await asyncio.gather(
+                *(pool.ping_idle(timeout=self.ping_interval / 2) for pool in self.pools.values()),
+                return_exceptions=True
+            )
+
+    async def call_tool(self, server_name: str, tool_name: str, arguments: dict,
+                        progress_callback=None):
+        return await self.pools[server_name].call_tool(
+            tool_name, arguments, progress_callback
+        )
+
+    async def close(self):
+        if self._pinger is not None:
+            self._pinger.cancel()
+        await asyncio.gather(*(pool.close() for pool in self.pools.values()))
+
+    def stats(self) -> dict:
+        return {name: pool.stats() for name, pool in self.pools.items()}
@@ -0,0 +1,150 @@
+import hashlib
+import json
+import os
+import re
+from collections import OrderedDict
+from langchain_core.tools import StructuredTool
+from token_counter import count_text_tokens
+
+# Tool results larger than this are kept out of the chat history
+LARGE_RESULT_TOKENS = int(os.getenv("LARGE_RESULT_TOKENS", "400"))
+RESULT_STORE_MB = float(os.getenv("RESULT_STORE_MB", "64"))
+
+MAX_FETCH_ROWS = 100
+MAX_DIGEST_STRING = 200
+
+# "res_<hash>" or "res_<hash>:data.yearly_data"
+REF_PATTERN = re.compile(r"^(res_[0-9a-f]{16})(?::([\w.]+))?$")
+
+
+class ResultStore:
+    """
+    Content-addressed store for large tool results.
+
+    Identical results share one entry. Entries are evicted least recently
+    used first once the store exceeds its memory limit.
+    """
+
+    def __init__(self, max_bytes: int = int(RESULT_STORE_MB * 1024 * 1024)):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[str, object]] = OrderedDict()
+        self.total_bytes = 0
+
+    def put(self, content: str, parsed) -> str:
+        handle = "res_" + hashlib.sha256(content.encode()).hexdigest()[:16]
+        if handle in self._entries:
+            self._entries.move_to_end(handle)
+            return handle
+
+        self._entries[handle] = (content, parsed)
+        self.total_bytes += len(content)
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            _, (evicted, _) = self._entries.popitem(last=False)
+            self.total_bytes -= len(evicted)
+        return handle
+
+    def resolve(self, ref: str):
+        """The value a ref points to. Raises KeyError for unknown refs."""
+        match = REF_PATTERN.match(ref)
+        if match is None or match.group(1) not in self._entries:
+            raise KeyError(f"Unknown or expired result reference '{ref}'. Call the original tool again.")
+
+        handle, path = match.groups()
+        self._entries.move_to_end(handle)
+        value = self._entries[handle][1]
+        for key in path.split(".") if path else []:
+            try:
+                value = value[int(key)] if isinstance(value, list) else value[key]
+            except (KeyError, IndexError, ValueError, TypeError):
+                raise KeyError(f"'{ref}' does not exist in the stored result.")
+        return value
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "total_bytes": self.total_bytes,
+            "max_bytes": self.max_bytes
+        }
+
+
+result_store = ResultStore()
+
+
+def _digest(value, ref: str):
+    """Shape and endpoints of every list; scalars as they are."""
+    if isinstance(value, list):
+        summary = {"ref": ref, "rows": len(value)}
+        if value and isinstance(value[0], dict):
+            summary["columns"] = list(value[0])
+        if value:
+            summary["first"] = value[0]
+            summary["last"] = value[-1]
+        return summary
+    if isinstance(value, dict):
+        return {key: _digest(item, f"{ref}.{key}") for key, item in value.items()}
+    if isinstance(value, str) and len(value) > MAX_DIGEST_STRING:
+        return {"ref": ref, "chars": len(value)}
+    return value
+
+
+def offload_large_result(content: str, parsed) -> str:
+    """
+    Keep large JSON tool results out of the chat history.
+
+    Returns `content` unchanged if it is small. Otherwise the full result
+    is stored and a digest with refs to each list is returned instead.
+    """
+    if not isinstance(parsed, (dict, list)) or count_text_tokens(content) <= LARGE_RESULT_TOKENS:
+        return content
+
+    handle = result_store.put(content, parsed)
+    root = "data" if isinstance(parsed, dict) and isinstance(parsed.get("data"), (dict, list)) else None
+    digest = _digest(parsed[root], f"{handle}:{root}") if root else _digest(parsed, handle)
+
+    return json.dumps({
+        "result_ref": handle,
+        "digest": digest,
+        "note": (
+            "Full result stored out of band. Use fetch_tool_result with a ref to "
+            "read rows, or pass a ref string in place of the data to another tool."
+        )
+    })
+
+
+def resolve_refs(args: dict) -> dict:
+    """Replace top-level arguments that are result refs with the stored data."""
+    return {
+        key: result_store.resolve(value)
+        if isinstance(value, str) and REF_PATTERN.match(value) else value
+        for key, value in args.items()
+    }
+
+
+def fetch_tool_result(ref: str, start: int = 0, limit: int = 20) -> str:
+    """
+    Read part of a large tool result that was stored out of band.
+
+    `ref` is a ref from a result digest, e.g. "res_0123abcd4567ef89:data.yearly_data".
+    For lists, returns `limit` rows (at most 100) beginning at index `start`.
+    """
+    if start < 0 or limit < 1:
+        return json.dumps({"error": "start must be >= 0 and limit must be >= 1."})
+
+    try:
+        value = result_store.resolve(ref)
+    except KeyError as e:
+        return json.dumps({"error": e.args[0]})
+
+    if not isinstance(value, list):
+        return json.dumps({"ref": ref, "value": value})
+
+    limit = min(limit, MAX_FETCH_ROWS)
+    return json.dumps({
+        "ref": ref,
+        "total_rows": len(value),
+        "start": start,
+        "rows": value[start:start + limit]
+    })
+
+
+fetch_tool_result_tool = StructuredTool.from_function(fetch_tool_result)
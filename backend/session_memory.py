@@ -1,74 +1,362 @@
-from typing import Dict, List
-from langchain_core.messages import BaseMessage, ToolMessage, AIMessage
+import json
+import os
+import re
+import time
+import zlib
+from collections import OrderedDict, deque
+from typing import List
+from langchain_core.messages import (
+    BaseMessage,
+    HumanMessage,
+    SystemMessage,
+    ToolMessage,
+    AIMessage,
+    messages_from_dict,
+    messages_to_dict
+)
 from system_prompts import get_system_message
+from token_counter import count_tokens
 
-session_store: Dict[str, List[BaseMessage]] = {}
+# Prompt tokens (system prompt + summary + history) sent per LLM round
+HISTORY_TOKEN_BUDGET = int(os.getenv("HISTORY_TOKEN_BUDGET", "6000"))
+# Figures from dropped turns kept in the rolling summary
+MAX_SUMMARY_FACTS = 20
+MAX_FACT_CHARS = 200
 
-MAX_MESSAGES = 20  # Prevent token explosion
+KEY_FIGURE_TERMS = re.compile(
+    r"\b(income|salary|earn|expense|spend|rent|emi|loan|debt|sav|invest|sip|"
+    r"goal|target|retire|age|corpus|budget|fund|insurance|lakh|crore)",
+    re.IGNORECASE
+)
+SENTENCE_BREAK = re.compile(r"(?<=[.!?;])\s+|\n+")
 
+# Approximate cap on memory held by all sessions together
+SESSION_MEMORY_LIMIT_MB = float(os.getenv("SESSION_MEMORY_LIMIT_MB", "256"))
+# Sessions untouched this long are serialized and compressed
+SESSION_IDLE_SECONDS = float(os.getenv("SESSION_IDLE_SECONDS", "300"))
+# Sessions untouched this long are dropped
+SESSION_TTL_SECONDS = float(os.getenv("SESSION_TTL_SECONDS", "86400"))
 
-def sanitize_history(history: List[BaseMessage]) -> List[BaseMessage]:
-    """Ensure every AIMessage with tool_calls has ALL its ToolMessages, and
-    every ToolMessage has a preceding AIMessage with tool_calls.
+# Rough per-object cost of a LangChain message, measured with tracemalloc
+MESSAGE_OVERHEAD_BYTES = 800
 
-    OpenAI throws 400 errors in both directions:
-    - AIMessage with tool_calls not followed by matching ToolMessages
-    - ToolMessage not preceded by an AIMessage with tool_calls
+# Every session shares one system prompt instead of holding its own copy.
+SYSTEM_MESSAGE = get_system_message()
+SYSTEM_TOKENS = count_tokens(SYSTEM_MESSAGE)
+
+
+def estimate_size(message: BaseMessage) -> int:
+    """Approximate bytes held by one live message."""
+    content = message.content
+    size = MESSAGE_OVERHEAD_BYTES + len(content if isinstance(content, str) else json.dumps(content))
+    if isinstance(message, AIMessage) and message.tool_calls:
+        size += len(json.dumps(message.tool_calls, default=str))
+    return size
+
+
+def extract_key_figures(text: str) -> List[str]:
+    """Sentences in which the user states a financial figure."""
+    return [
+        sentence.strip()[:MAX_FACT_CHARS]
+        for sentence in SENTENCE_BREAK.split(text)
+        if any(ch.isdigit() for ch in sentence) and KEY_FIGURE_TERMS.search(sentence)
+    ]
+
+
+class Session:
     """
-    # Pass 1: find all tool_call_ids that have a ToolMessage response
-    responded_ids: set = set()
-    for msg in history:
-        if isinstance(msg, ToolMessage):
-            responded_ids.add(msg.tool_call_id)
-
-    # Pass 2: rebuild history, skipping broken groups
-    clean = []
-    last_tool_ai: AIMessage | None = None  # track last AIMessage with tool_calls
-
-    for msg in history:
-        if isinstance(msg, AIMessage) and msg.tool_calls:
-            # Only keep if ALL tool_calls have a matching ToolMessage response
-            all_responded = all(tc["id"] in responded_ids for tc in msg.tool_calls)
-            if all_responded:
-                clean.append(msg)
-                last_tool_ai = msg
-            else:
-                last_tool_ai = None  # drop this group
-        elif isinstance(msg, ToolMessage):
-            # Only keep if there's a valid preceding AIMessage with tool_calls
-            if last_tool_ai is not None:
-                clean.append(msg)
-            # else: orphaned ToolMessage — drop it
+    One conversation, without its system prompt.
+
+    OpenAI rejects a history in which an AIMessage with tool_calls is not
+    followed by ALL its ToolMessages, or a ToolMessage has no preceding
+    AIMessage with tool_calls. Instead of re-checking the whole history
+    on every LLM round, the invariant is kept as messages arrive:
+
+    - `messages` holds only messages that are valid to send.
+    - A tool-call AIMessage and its ToolMessages wait in `pending` until
+      every call has been answered, then move to `messages` as one group.
+    - Any other message abandons an unfinished group; ToolMessages that
+      answer no pending call are dropped.
+
+    History is bounded by prompt tokens, not message count. Token counts
+    are computed once per message and kept in `costs`, alongside
+    `messages`. Once over budget, the oldest turns are dropped whole, so
+    tool-call groups are never split, and figures the user stated in
+    them (income, expenses, goals...) are kept in a rolling summary.
+
+    A session is either live (`messages` holds message objects) or idle
+    (`blob` holds the same messages as compressed JSON).
+    """
+
+    __slots__ = (
+        "messages", "costs", "tokens", "pending", "waiting", "facts",
+        "summary", "summary_tokens", "view", "blob", "count", "size", "last_access"
+    )
+
+    def __init__(self):
+        self.messages: deque[BaseMessage] | None = deque()
+        self.costs: deque[int] = deque()  # tokens per message in `messages`
+        self.tokens = 0
+        self.pending: List[BaseMessage] = []
+        self.waiting: set = set()  # tool_call_ids still unanswered
+        self.facts: List[str] = []
+        self.summary: SystemMessage | None = None
+        self.summary_tokens = 0
+        self.view: List[BaseMessage] | None = None
+        self.blob: bytes | None = None
+        self.count = 0
+        self.size = 0
+        self.last_access = time.monotonic()
+
+    @property
+    def is_idle(self) -> bool:
+        return self.blob is not None
+
+    def add(self, message: BaseMessage):
+        if isinstance(message, ToolMessage):
+            if message.tool_call_id not in self.waiting:
+                return  # orphaned ToolMessage — drop it
+            self.waiting.discard(message.tool_call_id)
+            self._hold(message)
+            if not self.waiting:
+                group, self.pending = self.pending, []
+                self._commit(group)
+            return
+
+        self._abandon_pending()
+        if isinstance(message, AIMessage) and message.tool_calls:
+            self.waiting = {tc["id"] for tc in message.tool_calls}
+            self._hold(message)
         else:
-            last_tool_ai = None  # reset on any non-tool message
-            clean.append(msg)
-    return clean
+            self.size += estimate_size(message)
+            self.count += 1
+            self._commit([message])
 
+    def _hold(self, message: BaseMessage):
+        self.pending.append(message)
+        self.size += estimate_size(message)
+        self.count += 1
 
-def get_session_history(session_id: str) -> List[BaseMessage]:
-    if session_id not in session_store:
-        session_store[session_id] = [get_system_message()]
-    return sanitize_history(session_store[session_id])
+    def _abandon_pending(self):
+        self.size -= sum(estimate_size(msg) for msg in self.pending)
+        self.count -= len(self.pending)
+        self.pending = []
+        self.waiting = set()
 
+    def _commit(self, group: List[BaseMessage]):
+        costs = [count_tokens(msg) for msg in group]
+        self.messages.extend(group)
+        self.costs.extend(costs)
+        self.tokens += sum(costs)
+        if self.view is not None:
+            self.view.extend(group)
 
-def append_to_session(session_id: str, message: BaseMessage):
-    if session_id not in session_store:
-        session_store[session_id] = [get_system_message()]
+        if self.prompt_tokens > HISTORY_TOKEN_BUDGET:
+            self._compact_history()
+
+    @property
+    def prompt_tokens(self) -> int:
+        return SYSTEM_TOKENS + self.summary_tokens + self.tokens
+
+    def _compact_history(self):
+        """Drop the oldest turns until the prompt fits the token budget."""
+        # The latest user message and everything after it always stay.
+        latest = next(
+            (i for i in range(len(self.messages) - 1, -1, -1)
+             if isinstance(self.messages[i], HumanMessage)),
+            len(self.messages) - 1
+        )
+        dropped = 0
+        while self.prompt_tokens > HISTORY_TOKEN_BUDGET and dropped < latest:
+            self._drop_oldest()
+            dropped += 1
+            # Whole turns go at once, so no tool-call group is ever split
+            while dropped < latest and not isinstance(self.messages[0], HumanMessage):
+                self._drop_oldest()
+                dropped += 1
+
+        if dropped:
+            self.view = None
+
+    def _drop_oldest(self):
+        message = self.messages.popleft()
+        self.tokens -= self.costs.popleft()
+        self.size -= estimate_size(message)
+        self.count -= 1
+        if isinstance(message, HumanMessage):
+            if isinstance(message.content, str):
+                self._remember(extract_key_figures(message.content))
+
+    def _remember(self, figures: List[str]):
+        new = [fact for fact in figures if fact not in self.facts]
+        if not new:
+            return
+        self.facts = (self.facts + new)[-MAX_SUMMARY_FACTS:]
+        self.summary = SystemMessage(
+            content="Summary of earlier turns. Figures the user gave:\n"
+            + "\n".join(f"- {fact}" for fact in self.facts)
+        )
+        self.summary_tokens = count_tokens(self.summary)
+
+    def history(self) -> List[BaseMessage]:
+        """Sendable history, cached until the committed messages change."""
+        if self.view is None:
+            head = [SYSTEM_MESSAGE, self.summary] if self.summary else [SYSTEM_MESSAGE]
+            self.view = [*head, *self.messages]
+        return self.view
 
-    session_store[session_id].append(message)
-    trim_history(session_id)
+    def compact(self):
+        self.blob = zlib.compress(json.dumps({
+            "facts": self.facts,
+            "messages": messages_to_dict([*self.messages, *self.pending])
+        }, separators=(",", ":")).encode())
+        self.messages = None
+        self.costs = deque()
+        self.pending = []
+        self.view = None
+        self.size = len(self.blob)
 
+    def rehydrate(self):
+        stored = json.loads(zlib.decompress(self.blob))
+        self.blob = None
+        self.messages = deque()
+        self.tokens = 0
+        self.waiting = set()
+        self.facts = []
+        self.summary = None
+        self.summary_tokens = 0
+        self.count = 0
+        self.size = 0
+        self._remember(stored["facts"])
+        for message in messages_from_dict(stored["messages"]):
+            self.add(message)
 
-def trim_history(session_id: str):
-    history = session_store[session_id]
 
-    if len(history) > MAX_MESSAGES:
-        system_msg = history[0]
-        trimmed = [system_msg] + history[-(MAX_MESSAGES - 1):]
-        # Sanitize after trimming to remove any newly orphaned ToolMessages
-        session_store[session_id] = trimmed
+class SessionStore:
+    """
+    Bounded in-memory session store.
+
+    Live sessions are kept in LRU order. Sessions idle for longer than
+    `idle_seconds` are compacted and rehydrated lazily on next access;
+    sessions idle for longer than `ttl_seconds`, or least recently used
+    once the memory limit is exceeded, are evicted.
+    """
+
+    def __init__(
+        self,
+        memory_limit_bytes: int = int(SESSION_MEMORY_LIMIT_MB * 1024 * 1024),
+        idle_seconds: float = SESSION_IDLE_SECONDS,
+        ttl_seconds: float = SESSION_TTL_SECONDS
+    ):
+        self.memory_limit_bytes = memory_limit_bytes
+        self.idle_seconds = idle_seconds
+        self.ttl_seconds = ttl_seconds
+        # Both ordered by last access, oldest first
+        self._live: OrderedDict[str, Session] = OrderedDict()
+        self._idle: OrderedDict[str, Session] = OrderedDict()
+        self.total_bytes = 0
+        self.evictions = 0
+        self.rehydrations = 0
+
+    def _touch(self, session_id: str) -> Session:
+        now = time.monotonic()
+        self._expire(now)
+
+        session = self._live.pop(session_id, None)
+        if session is None:
+            session = self._idle.pop(session_id, None) or Session()
+            if session.is_idle:
+                self.total_bytes -= session.size
+                session.rehydrate()
+                self.total_bytes += session.size
+                self.rehydrations += 1
+
+        session.last_access = now
+        self._live[session_id] = session
+        return session
+
+    def _expire(self, now: float):
+        """Compact and evict from the stale end of each LRU list."""
+        while self._live:
+            session_id, session = next(iter(self._live.items()))
+            if now - session.last_access < self.idle_seconds:
+                break
+            del self._live[session_id]
+            self.total_bytes -= session.size
+            session.compact()
+            self.total_bytes += session.size
+            self._idle[session_id] = session
+
+        while self._idle:
+            session_id, session = next(iter(self._idle.items()))
+            if now - session.last_access < self.ttl_seconds:
+                break
+            self._evict(self._idle, session_id)
+
+    def _evict(self, sessions: OrderedDict, session_id: str):
+        self.total_bytes -= sessions.pop(session_id).size
+        self.evictions += 1
+
+    def _enforce_limit(self, keep: str):
+        """Evict least recently used sessions, idle ones first, until under the limit."""
+        for sessions in (self._idle, self._live):
+            while self.total_bytes > self.memory_limit_bytes and sessions:
+                session_id = next(iter(sessions))
+                if session_id == keep:
+                    break
+                self._evict(sessions, session_id)
+
+    def history(self, session_id: str) -> List[BaseMessage]:
+        return self._touch(session_id).history()
+
+    def append(self, session_id: str, message: BaseMessage):
+        session = self._touch(session_id)
+        size = session.size
+        session.add(message)
+        self.total_bytes += session.size - size
+        self._enforce_limit(keep=session_id)
+
+    def clear(self, session_id: str):
+        for sessions in (self._live, self._idle):
+            if session_id in sessions:
+                self.total_bytes -= sessions.pop(session_id).size
+
+    def stats(self, top: int = 20) -> dict:
+        now = time.monotonic()
+        sessions = [
+            {
+                "session_id": session_id,
+                "state": "idle" if session.is_idle else "live",
+                "messages": session.count,
+                "bytes": session.size,
+                "idle_seconds": round(now - session.last_access, 1)
+            }
+            for sessions in (self._live, self._idle)
+            for session_id, session in sessions.items()
+        ]
+        sessions.sort(key=lambda entry: entry["bytes"], reverse=True)
+        return {
+            "live_sessions": len(self._live),
+            "idle_sessions": len(self._idle),
+            "total_bytes": self.total_bytes,
+            "memory_limit_bytes": self.memory_limit_bytes,
+            "evictions": self.evictions,
+            "rehydrations": self.rehydrations,
+            "largest_sessions": sessions[:top]
+        }
+
+
+session_store = SessionStore()
+
+
+def get_session_history(session_id: str) -> List[BaseMessage]:
+    """The session's sendable history. Shared and cached — do not mutate."""
+    return session_store.history(session_id)
+
+
+def append_to_session(session_id: str, message: BaseMessage):
+    session_store.append(session_id, message)
 
 
 def clear_session(session_id: str):
-    if session_id in session_store:
-        del session_store[session_id]
+    session_store.clear(session_id)
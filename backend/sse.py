@@ -0,0 +1,111 @@
+import asyncio
+import json
+import os
+import zlib
+from contextlib import aclosing
+from typing import AsyncIterator
+from fastapi.responses import StreamingResponse
+
+# Tokens are batched into one frame for at most this long...
+SSE_FLUSH_MS = float(os.getenv("SSE_FLUSH_MS", "25"))
+# ...or until this many characters are waiting
+SSE_MAX_BATCH_CHARS = int(os.getenv("SSE_MAX_BATCH_CHARS", "256"))
+# gzip the stream for clients that accept it, flushing every frame
+SSE_GZIP = os.getenv("SSE_GZIP", "false").lower() in ("1", "true", "yes")
+
+# One shared encoder instead of json.dumps' per-call setup
+_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def frame(event: dict) -> bytes:
+    return f"data: {_encoder.encode(event)}\n\n".encode()
+
+
+async def coalesce_tokens(
+    events: AsyncIterator[dict],
+    flush_ms: float = SSE_FLUSH_MS,
+    max_chars: int = SSE_MAX_BATCH_CHARS
+) -> AsyncIterator[bytes]:
+    """
+    Encode events as SSE frames, merging consecutive 'token' events.
+
+    Buffered tokens are flushed when the window expires even if the
+    stream stalls, and before any other event so ordering is preserved.
+    """
+    loop = asyncio.get_running_loop()
+    tokens: list[str] = []
+    size = 0
+    deadline = 0.0
+    pending: asyncio.Future | None = None
+
+    def flush() -> bytes:
+        nonlocal size
+        data = frame({"type": "token", "content": "".join(tokens)})
+        tokens.clear()
+        size = 0
+        return data
+
+    async with aclosing(events):
+        try:
+            while True:
+                if pending is None:
+                    pending = asyncio.ensure_future(anext(events))
+                timeout = max(0.0, deadline - loop.time()) if tokens else None
+                done, _ = await asyncio.wait({pending}, timeout=timeout)
+                if not done:
+                    yield flush()
+                    continue
+
+                finished, pending = pending, None
+                try:
+                    event = finished.result()
+                except StopAsyncIteration:
+                    break
+
+                if event.get("type") == "token":
+                    if not tokens:
+                        deadline = loop.time() + flush_ms / 1000
+                    tokens.append(event["content"])
+                    size += len(event["content"])
+                    if size >= max_chars:
+                        yield flush()
+                    continue
+
+                if tokens:
+                    yield flush()
+                yield frame(event)
+
+            if tokens:
+                yield flush()
+        finally:
+            if pending is not None:
+                pending.cancel()
+                try:
+                    await pending
+                except (asyncio.CancelledError, StopAsyncIteration):
+                    pass
+
+
+async def gzip_frames(frames: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """gzip a frame stream, sync-flushing after each frame so nothing is held back."""
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    async with aclosing(frames):
+        async for data in frames:
+            yield compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+
+def sse_response(events: AsyncIterator[dict], accept_encoding: str = "") -> StreamingResponse:
+    """Stream events as SSE, coalescing tokens and gzipping when enabled and accepted."""
+    frames = coalesce_tokens(events)
+    headers = {
+        "Cache-Control": "no-cache",
+        # Stop nginx-style proxies from buffering the stream
+        "X-Accel-Buffering": "no"
+    }
+    if SSE_GZIP and "gzip" in accept_encoding:
+        frames = gzip_frames(frames)
+        headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
+
+    return StreamingResponse(frames, media_type="text/event-stream", headers=headers)
@@ -0,0 +1,50 @@
+import json
+import logging
+from langchain_core.messages import BaseMessage, AIMessage
+from llm_client import LLM_MODEL
+
+logger = logging.getLogger(__name__)
+
+# Fixed per-message cost of the chat format (role and separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+# Used when no tokenizer is available
+CHARS_PER_TOKEN = 4
+
+_encoding = None
+_encoding_loaded = False
+
+
+def _get_encoding():
+    """The model's tiktoken encoding, or None if it cannot be loaded."""
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        _encoding_loaded = True
+        try:
+            import tiktoken
+            try:
+                _encoding = tiktoken.encoding_for_model(LLM_MODEL)
+            except KeyError:
+                _encoding = tiktoken.get_encoding("o200k_base")
+        except Exception as e:
+            # tiktoken downloads its vocabularies on first use.
+            logger.warning(f"Tokenizer unavailable, estimating tokens from length: {e}")
+    return _encoding
+
+
+def count_text_tokens(text: str) -> int:
+    encoding = _get_encoding()
+    if encoding is None:
+        return len(text) // CHARS_PER_TOKEN + 1
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def count_tokens(message: BaseMessage) -> int:
+    """Prompt tokens one message costs, including its tool calls."""
+    content = message.content
+    text = content if isinstance(content, str) else json.dumps(content)
+    if isinstance(message, AIMessage) and message.tool_calls:
+        text += json.dumps(
+            [{"name": tc["name"], "args": tc["args"]} for tc in message.tool_calls],
+            default=str
+        )
+    return count_text_tokens(text) + MESSAGE_OVERHEAD_TOKENS
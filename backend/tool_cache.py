@@ -0,0 +1,113 @@
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+TOOL_CACHE_SIZE = int(os.getenv("TOOL_CACHE_SIZE", "1024"))
+TOOL_CACHE_TTL = float(os.getenv("TOOL_CACHE_TTL", "3600"))
+
+
+def is_pure(tool) -> bool:
+    """A tool opts in to caching via MCP readOnly + idempotent annotations."""
+    metadata = getattr(tool, "metadata", None) or {}
+    return bool(metadata.get("readOnlyHint") and metadata.get("idempotentHint"))
+
+
+def _canonical(value):
+    # 12 and 12.0 are the same argument to a financial formula.
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, dict):
+        return {k: _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    return value
+
+
+def cache_key(tool_name: str, tool_args: dict) -> str:
+    """Tool name plus canonical JSON of its arguments."""
+    args = json.dumps(_canonical(tool_args), sort_keys=True, separators=(",", ":"))
+    return f"{tool_name}:{args}"
+
+
+class ToolResultCache:
+    """
+    LRU + TTL cache for results of pure tools, with single-flight
+    deduplication: concurrent identical calls share one in-flight request.
+    """
+
+    def __init__(self, max_entries: int = TOOL_CACHE_SIZE, ttl: float = TOOL_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    async def get_or_call(
+        self,
+        key: str,
+        call: Callable[[], Awaitable[Any]],
+        should_store: Callable[[Any], bool] = lambda result: True
+    ):
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.misses += 1
+            # The shared call runs in its own task so that one caller
+            # disconnecting does not cancel it for the others.
+            task = asyncio.ensure_future(call())
+            self._inflight[key] = task
+            task.add_done_callback(
+                lambda done: self._finish(key, done, should_store)
+            )
+        else:
+            self.coalesced += 1
+
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Future, should_store):
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        result = task.result()
+        if not should_store(result):
+            return
+
+        self._entries[key] = (time.monotonic() + self.ttl, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "in_flight": len(self._inflight),
+            "hit_rate": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0
+        }
+
+
+tool_cache = ToolResultCache()
@@ -3,6 +3,7 @@ import ReactMarkdown from 'react-markdown';
 import remarkGfm from 'remark-gfm';
 import { Bot, User } from 'lucide-react';
 import clsx from 'clsx';
+import { SpecChart } from './SpecChart';
 
 export function MessageBubble({ role, content, charts }) {
     const isUser = role === 'user';
@@ -42,16 +43,20 @@ export function MessageBubble({ role, content, charts }) {
                             </div>
                         )}
 
-                        {/* Chart images rendered directly as <img> tags */}
+                        {/* Chart images as <img> tags, chart specs drawn as SVG */}
                         {charts && charts.length > 0 && (
                             <div className="mt-4 space-y-4">
-                                {charts.map((src, idx) => (
+                                {charts.map((chart, idx) => (
                                     <div key={idx} className="rounded-xl overflow-hidden border border-finance-border shadow-lg bg-white inline-block max-w-md">
-                                        <img
-                                            src={src}
-                                            alt={`Financial Chart ${idx + 1}`}
-                                            className="w-full h-auto block"
-                                        />
+                                        {typeof chart === 'string' ? (
+                                            <img
+                                                src={chart}
+                                                alt={`Financial Chart ${idx + 1}`}
+                                                className="w-full h-auto block"
+                                            />
+                                        ) : (
+                                            <SpecChart spec={chart} />
+                                        )}
                                     </div>
                                 ))}
                             </div>
@@ -0,0 +1,133 @@
+import React, { useState } from 'react';
+
+const WIDTH = 448;
+const HEIGHT = 300;
+const PAD = { top: 32, right: 16, bottom: 40, left: 64 };
+const COLORS = ['#2563eb', '#f97316', '#16a34a', '#9333ea'];
+const TICKS = 5;
+
+const compact = new Intl.NumberFormat('en-IN', { notation: 'compact', maximumFractionDigits: 1 });
+const full = new Intl.NumberFormat('en-IN', { maximumFractionDigits: 0 });
+
+function extent(values) {
+    let min = Infinity;
+    let max = -Infinity;
+    for (const v of values) {
+        if (v < min) min = v;
+        if (v > max) max = v;
+    }
+    return min === max ? [min - 1, max + 1] : [min, max];
+}
+
+function ticks([min, max]) {
+    return Array.from({ length: TICKS }, (_, i) => min + ((max - min) * i) / (TICKS - 1));
+}
+
+/**
+ * Draws a chart_spec from the chart server (line series, shaded bands
+ * and end-point annotations) as an SVG, with a hover readout per year.
+ */
+export function SpecChart({ spec }) {
+    const [hover, setHover] = useState(null);
+    const series = spec.series || [];
+    const bands = spec.bands || [];
+
+    const xs = [...series.flatMap((s) => s.x), ...bands.flatMap((b) => b.x)];
+    const ys = [...series.flatMap((s) => s.y), ...bands.flatMap((b) => [...b.low, ...b.high])];
+    if (xs.length === 0) return null;
+
+    const [x0, x1] = extent(xs);
+    const [y0, y1] = extent([0, ...ys]);
+    const sx = (x) => PAD.left + ((x - x0) / (x1 - x0)) * (WIDTH - PAD.left - PAD.right);
+    const sy = (y) => HEIGHT - PAD.bottom - ((y - y0) / (y1 - y0)) * (HEIGHT - PAD.top - PAD.bottom);
+    const points = (x, y) => x.map((xi, i) => `${sx(xi)},${sy(y[i])}`).join(' ');
+
+    // Nearest x in the first series to the pointer
+    const base = series[0] || { x: bands[0].x };
+    const onMove = (event) => {
+        const rect = event.currentTarget.getBoundingClientRect();
+        const x = x0 + (((event.clientX - rect.left) / rect.width) * WIDTH - PAD.left) / (WIDTH - PAD.left - PAD.right) * (x1 - x0);
+        let best = 0;
+        base.x.forEach((xi, i) => {
+            if (Math.abs(xi - x) < Math.abs(base.x[best] - x)) best = i;
+        });
+        setHover(best);
+    };
+
+    return (
+        <svg
+            viewBox={`0 0 ${WIDTH} ${HEIGHT}`}
+            className="w-full h-auto block text-slate-700"
+            onMouseMove={onMove}
+            onMouseLeave={() => setHover(null)}
+            role="img"
+            aria-label={spec.title}
+        >
+            <text x={WIDTH / 2} y={18} textAnchor="middle" fontSize="13" fontWeight="600" fill="currentColor">
+                {spec.title}
+            </text>
+
+            {/* Grid and axes */}
+            {ticks([y0, y1]).map((t) => (
+                <g key={t}>
+                    <line x1={PAD.left} x2={WIDTH - PAD.right} y1={sy(t)} y2={sy(t)} stroke="#e2e8f0" />
+                    <text x={PAD.left - 6} y={sy(t) + 3} textAnchor="end" fontSize="10" fill="currentColor">
+                        {compact.format(t)}
+                    </text>
+                </g>
+            ))}
+            {ticks([x0, x1]).map((t) => (
+                <text key={t} x={sx(t)} y={HEIGHT - PAD.bottom + 14} textAnchor="middle" fontSize="10" fill="currentColor">
+                    {Math.round(t)}
+                </text>
+            ))}
+            <text x={WIDTH / 2} y={HEIGHT - 8} textAnchor="middle" fontSize="11" fill="currentColor">
+                {spec.axes?.x?.label}
+            </text>
+            <text transform={`translate(12 ${HEIGHT / 2}) rotate(-90)`} textAnchor="middle" fontSize="11" fill="currentColor">
+                {spec.axes?.y?.label}
+            </text>
+
+            {bands.map((band, i) => (
+                <polygon
+                    key={band.name}
+                    points={`${points(band.x, band.high)} ${points([...band.x].reverse(), [...band.low].reverse())}`}
+                    fill={COLORS[i % COLORS.length]}
+                    fillOpacity="0.15"
+                />
+            ))}
+            {series.map((s, i) => (
+                <polyline key={s.name} points={points(s.x, s.y)} fill="none" stroke={COLORS[i % COLORS.length]} strokeWidth="2" />
+            ))}
+
+            {/* Legend */}
+            {series.map((s, i) => (
+                <g key={s.name} transform={`translate(${PAD.left + 8} ${PAD.top + 4 + i * 14})`}>
+                    <rect width="10" height="3" y="-4" fill={COLORS[i % COLORS.length]} />
+                    <text x="14" fontSize="10" fill="currentColor">{s.name}</text>
+                </g>
+            ))}
+
+            {hover === null && (spec.annotations || []).map((a) => (
+                <g key={a.text}>
+                    <circle cx={sx(a.x)} cy={sy(a.y)} r="3" fill="currentColor" />
+                    <text x={sx(a.x) - 6} y={sy(a.y) - 6} textAnchor="end" fontSize="10" fill="currentColor">{a.text}</text>
+                </g>
+            ))}
+
+            {hover !== null && (
+                <g>
+                    <line x1={sx(base.x[hover])} x2={sx(base.x[hover])} y1={PAD.top} y2={HEIGHT - PAD.bottom} stroke="#94a3b8" strokeDasharray="3 3" />
+                    <text x={sx(base.x[hover]) + (sx(base.x[hover]) > WIDTH / 2 ? -6 : 6)} y={PAD.top + 4} textAnchor={sx(base.x[hover]) > WIDTH / 2 ? 'end' : 'start'} fontSize="10" fill="currentColor">
+                        {`${spec.axes?.x?.label || 'x'} ${base.x[hover]}`}
+                        {series.map((s) => (
+                            <tspan key={s.name} x={sx(base.x[hover]) + (sx(base.x[hover]) > WIDTH / 2 ? -6 : 6)} dy="12">
+                                {`${s.name}: ${full.format(s.y[hover] ?? 0)}`}
+                            </tspan>
+                        ))}
+                    </text>
+                </g>
+            )}
+        </svg>
+    );
+}
@@ -27,6 +27,9 @@ export function useChat(sessionId) {
                 body: JSON.stringify({ session_id: sessionId, message: userText }),
             });
 
+            if (response.status === 429) {
+                throw new Error("Server is busy, please try again in a moment");
+            }
             if (!response.ok) {
                 throw new Error(`Server error: ${response.status}`);
             }
@@ -61,6 +64,9 @@ export function useChat(sessionId) {
 
                         switch (data.type) {
                             case "token":
+                                setActiveTool((current) =>
+                                    current && current.startsWith("Queued") ? null : current
+                                );
                                 // Append token to the last (assistant) message
                                 setMessages((prev) => {
                                     const updated = [...prev];
@@ -81,7 +87,25 @@ export function useChat(sessionId) {
                                     const lastMsg = updated[lastIndex];
                                     updated[lastIndex] = {
                                         ...lastMsg,
-                                        charts: [...(lastMsg.charts || []), data.src],
+                                        // Chart URLs are relative to the backend
+                                        charts: [
+                                            ...(lastMsg.charts || []),
+                                            data.src.startsWith("/") ? `${API_URL}${data.src}` : data.src,
+                                        ],
+                                    };
+                                    return updated;
+                                });
+                                break;
+
+                            case "chart_spec":
+                                // JSON chart description, drawn by SpecChart alongside images
+                                setMessages((prev) => {
+                                    const updated = [...prev];
+                                    const lastIndex = updated.length - 1;
+                                    const lastMsg = updated[lastIndex];
+                                    updated[lastIndex] = {
+                                        ...lastMsg,
+                                        charts: [...(lastMsg.charts || []), data.spec],
                                     };
                                     return updated;
                                 });
@@ -91,8 +115,24 @@ export function useChat(sessionId) {
                                 setActiveTool(data.tool);
                                 break;
 
+                            case "progress":
+                                // Interim results from long-running tools (e.g. Monte Carlo)
+                                if (data.total) {
+                                    const percent = Math.round((data.progress / data.total) * 100);
+                                    setActiveTool(`${data.tool} (${percent}%)`);
+                                }
+                                break;
+
                             case "tool_end":
-                                setActiveTool(null);
+                                // Tools run concurrently — only clear if this tool is the one shown
+                                setActiveTool((current) =>
+                                    current && current.startsWith(data.tool) ? null : current
+                                );
+                                break;
+
+                            case "queued":
+                                // Waiting for an earlier message or a free server slot
+                                setActiveTool(`Queued (position ${data.position})`);
                                 break;
 
                             case "status":
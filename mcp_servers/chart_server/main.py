@@ -1,57 +1,145 @@
+import time
+
+_started = time.perf_counter()
+
 import sys
 import os
-import subprocess
+import threading
 
 # Ensure local modules are importable in cloud environment
 # where working directory is /app (repo root), not /app/mcp_servers/chart_server
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-# Auto-install matplotlib if missing (workaround for FastMCP Cloud builder bug
-# that fails to install dependencies from subdirectory pyproject.toml/requirements.txt)
-try:
-    import matplotlib
-except ImportError:
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "matplotlib"])
-
 from fastmcp import FastMCP
+from starlette.requests import Request
+from starlette.responses import JSONResponse
 from logger import setup_logger
+import renderer
+from utils import SPEC_FORMAT
 from tools import (
     generate_investment_growth_chart,
-    generate_comparison_chart
+    generate_comparison_chart,
+    generate_fan_chart,
+    growth_chart_spec,
+    comparison_chart_spec,
+    fan_chart_spec
 )
 
 logger = setup_logger()
 mcp = FastMCP("Chart Server")
 
+# matplotlib itself is only imported by render workers
+renderer.startup_timings["imports"] = round(time.perf_counter() - _started, 3)
+
+
+@mcp.custom_route("/ready", methods=["GET"])
+async def readiness(request: Request):
+    """200 once render workers have finished their warm-up render, 503 before."""
+    status = renderer.stats()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+
+# Output options shared by every chart tool:
+#   format: "png" (default), "svg", "webp", or "spec" for a JSON chart
+#           description the client draws itself (no rendering at all)
+#   dpi: 50-300, width / height: inches (2-20)
+# Series longer than the image can show are thinned automatically.
+
 
 @mcp.tool()
-def generate_growth_chart_tool(yearly_data: list):
+async def generate_growth_chart_tool(
+    yearly_data: list,
+    format: str = "png",
+    dpi: int = 100,
+    width: float = 6.4,
+    height: float = 4.8
+):
     logger.info("Generating investment growth chart")
-    result = generate_investment_growth_chart(yearly_data)
+    if format == SPEC_FORMAT:
+        return growth_chart_spec(yearly_data, dpi, width, height)
+    result = await renderer.render(
+        generate_investment_growth_chart,
+        yearly_data,
+        format,
+        dpi,
+        width,
+        height
+    )
     logger.info("Chart generated successfully")
     return result
 
 
 @mcp.tool()
-def generate_comparison_chart_tool(
+async def generate_comparison_chart_tool(
     data_1: list,
     data_2: list,
     label_1: str,
-    label_2: str
+    label_2: str,
+    format: str = "png",
+    dpi: int = 100,
+    width: float = 6.4,
+    height: float = 4.8
 ):
     logger.info("Generating comparison chart")
-    result = generate_comparison_chart(
+    if format == SPEC_FORMAT:
+        return comparison_chart_spec(data_1, data_2, label_1, label_2, dpi, width, height)
+    result = await renderer.render(
+        generate_comparison_chart,
         data_1,
         data_2,
         label_1,
-        label_2
+        label_2,
+        format,
+        dpi,
+        width,
+        height
     )
     logger.info("Comparison chart generated successfully")
     return result
 
 
+@mcp.tool()
+async def generate_fan_chart_tool(
+    yearly_percentiles: dict,
+    title: str = "Projected Value Range",
+    format: str = "png",
+    dpi: int = 100,
+    width: float = 6.4,
+    height: float = 4.8
+):
+    logger.info("Generating fan chart")
+    if format == SPEC_FORMAT:
+        return fan_chart_spec(yearly_percentiles, title, dpi, width, height)
+    result = await renderer.render(
+        generate_fan_chart,
+        yearly_percentiles,
+        title,
+        format,
+        dpi,
+        width,
+        height
+    )
+    logger.info("Fan chart generated successfully")
+    return result
+
+
+def _warm_up():
+    renderer.start()
+    timings = renderer.startup_timings
+    logger.info(
+        f"Chart server ready in {time.perf_counter() - _started:.2f}s | "
+        + ", ".join(f"{phase}={seconds}s" for phase, seconds in timings.items())
+    )
+
+
 if __name__ == "__main__":
+    if "--build-font-cache" in sys.argv:
+        renderer.build_font_cache()
+        sys.exit(0)
+
     logger.info("Starting Chart MCP Server...")
+    # Accept connections right away; /ready reports when workers are warm
+    threading.Thread(target=_warm_up, name="chart-warm-up", daemon=True).start()
     mcp.run(
         transport="streamable_http",
         host="0.0.0.0",
@@ -0,0 +1,162 @@
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+# Worker processes rendering charts in parallel
+CHART_WORKERS = int(os.getenv("CHART_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Renders running or waiting before new requests are refused
+MAX_QUEUED_RENDERS = int(os.getenv("CHART_MAX_QUEUED", str(CHART_WORKERS * 4)))
+# Rendered charts kept for identical requests
+CHART_CACHE_SIZE = int(os.getenv("CHART_CACHE_SIZE", "128"))
+
+WORKER_PRELOAD = ("matplotlib.figure", "matplotlib.backends.backend_agg", "matplotlib.font_manager")
+# Seconds to wait for every worker to start and warm up
+WARM_TIMEOUT = 120
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+# Set once every worker has completed a warm-up render
+ready = threading.Event()
+# Seconds spent in each startup phase
+startup_timings: dict[str, float] = {}
+_pending = 0
+_cache: OrderedDict[str, dict] = OrderedDict()
+_hits = 0
+_misses = 0
+
+
+_warm_seconds = 0.0
+_warm_barrier = None
+
+
+def _warm_worker(barrier=None):
+    """Load matplotlib, the Agg canvas and the font cache once per worker."""
+    global _warm_seconds, _warm_barrier
+    _warm_barrier = barrier
+    started = time.perf_counter()
+    from utils import new_figure, generate_base64_plot
+
+    fig = new_figure()
+    fig.axes[0].plot([0, 1], [0, 1], label="warm-up")
+    fig.axes[0].set_title("warm-up")
+    fig.axes[0].legend()
+    generate_base64_plot(fig)
+    _warm_seconds = time.perf_counter() - started
+
+
+def _worker_warm_seconds() -> tuple[int, float]:
+    """
+    Report this worker's PID and warm-up time. Every call waits on a
+    barrier with one party per worker, and a worker runs one task at a
+    time, so the calls can only complete on distinct, warmed-up workers.
+    """
+    _warm_barrier.wait(WARM_TIMEOUT)
+    return os.getpid(), _warm_seconds
+
+
+def build_font_cache():
+    """
+    Build matplotlib's font cache ahead of time, e.g. as an image build
+    step, so no process has to scan system fonts on its first chart.
+    """
+    import matplotlib.font_manager  # noqa: F401 — building the cache is an import side effect
+
+
+def _importable(func) -> bool:
+    """
+    Worker processes find functions by module name. When this server is
+    mounted inside another process its modules are not importable under
+    that name, so renders then run on a thread instead.
+    """
+    module = sys.modules.get(func.__module__)
+    return module is not None and module.__dict__ is func.__globals__
+
+
+def _cache_key(func, args: tuple) -> str:
+    """Hash of the chart function and everything it draws: data, labels and style."""
+    payload = json.dumps([func.__module__, func.__qualname__, args], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def start():
+    """Start the worker pool, wait until each distinct worker has warmed up, then mark ready."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            return
+        started = time.perf_counter()
+        # forkserver workers start from a clean process, so the pool may
+        # be started from a background thread while the server runs. The
+        # fork server loads matplotlib and the font cache once; every
+        # worker forked from it inherits them.
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(["__main__", *WORKER_PRELOAD])
+        _pool = ProcessPoolExecutor(
+            max_workers=CHART_WORKERS,
+            mp_context=context,
+            initializer=_warm_worker,
+            initargs=(context.Barrier(CHART_WORKERS),)
+        )
+        warm = [_pool.submit(_worker_warm_seconds) for _ in range(CHART_WORKERS)]
+        reports = dict(f.result() for f in warm)
+        if len(reports) != CHART_WORKERS:
+            raise RuntimeError(f"Only {len(reports)} of {CHART_WORKERS} chart workers warmed up.")
+        startup_timings["warm_render"] = round(max(reports.values()), 3)
+        startup_timings["worker_pool"] = round(time.perf_counter() - started, 3)
+        ready.set()
+
+
+async def render(func, *args):
+    """
+    Run a chart function off the event loop, or return the cached result
+    of an identical earlier render.
+
+    Raises RuntimeError when MAX_QUEUED_RENDERS are already in flight,
+    so a burst fails fast instead of queueing without bound.
+    """
+    global _pending, _hits, _misses
+    key = _cache_key(func, args)
+    if key in _cache:
+        _cache.move_to_end(key)
+        _hits += 1
+        return _cache[key]
+
+    if _pending >= MAX_QUEUED_RENDERS:
+        raise RuntimeError("Chart server is busy, please retry shortly.")
+
+    _misses += 1
+    _pending += 1
+    try:
+        if not (_importable(func) and _importable(_warm_worker)):
+            result = await asyncio.to_thread(func, *args)
+        else:
+            if _pool is None:
+                await asyncio.to_thread(start)
+            result = await asyncio.wrap_future(_pool.submit(func, *args))
+    finally:
+        _pending -= 1
+
+    _cache[key] = result
+    while len(_cache) > CHART_CACHE_SIZE:
+        _cache.popitem(last=False)
+    return result
+
+
+def stats() -> dict:
+    return {
+        "ready": ready.is_set(),
+        "startup_seconds": startup_timings,
+        "workers": CHART_WORKERS,
+        "pending": _pending,
+        "max_queued": MAX_QUEUED_RENDERS,
+        "cached": len(_cache),
+        "cache_hits": _hits,
+        "cache_misses": _misses
+    }
@@ -0,0 +1,21 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils import generate_base64_plot, new_figure
+
+
+def _render(format: str) -> str:
+    fig = new_figure()
+    fig.axes[0].plot([1, 2, 3], [10, 20, 15], label="value")
+    fig.axes[0].legend()
+    return generate_base64_plot(fig, format=format)["image_base64"]
+
+
+def test_svg_renders_are_identical():
+    assert _render("svg") == _render("svg")
+
+
+def test_png_renders_are_identical():
+    assert _render("png") == _render("png")
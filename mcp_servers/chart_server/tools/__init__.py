@@ -1,2 +1,4 @@
 from .line_chart import generate_investment_growth_chart
 from .comparison_chart import generate_comparison_chart
+from .fan_chart import generate_fan_chart
+from .chart_spec import growth_chart_spec, comparison_chart_spec, fan_chart_spec
@@ -0,0 +1,97 @@
+from utils import validate_output, downsample, SPEC_FORMAT
+
+SPEC_VERSION = 1
+
+
+def _spec(title: str, series: list, bands: list = (), annotations: list = ()) -> dict:
+    return {
+        "chart_spec": {
+            "version": SPEC_VERSION,
+            "type": "line",
+            "title": title,
+            "axes": {
+                "x": {"label": "Year"},
+                "y": {"label": "Portfolio Value"}
+            },
+            "series": series,
+            "bands": list(bands),
+            "annotations": list(annotations)
+        }
+    }
+
+
+def _cents(values) -> list:
+    # Sub-cent precision only adds bytes to the spec
+    return [round(v, 2) for v in values]
+
+
+def _end_label(name: str, x: list, y: list) -> dict:
+    return {"x": x[-1], "y": y[-1], "text": f"{name}: {y[-1]:,.0f}"}
+
+
+def growth_chart_spec(yearly_data: list, dpi: int = 100, width: float = 6.4, height: float = 4.8):
+    """Same chart as generate_investment_growth_chart, as a JSON description."""
+    validate_output(SPEC_FORMAT, dpi, width, height)
+
+    years = [item["year"] for item in yearly_data]
+    values = [item["value"] for item in yearly_data]
+    years, values = downsample(width, dpi, years, values)
+
+    return _spec(
+        "Investment Growth",
+        [{"name": "Portfolio Value", "x": years, "y": _cents(values)}],
+        annotations=[_end_label("Final value", years, _cents(values))]
+    )
+
+
+def comparison_chart_spec(
+    data_1: list,
+    data_2: list,
+    label_1: str,
+    label_2: str,
+    dpi: int = 100,
+    width: float = 6.4,
+    height: float = 4.8
+):
+    """Same chart as generate_comparison_chart, as a JSON description."""
+    validate_output(SPEC_FORMAT, dpi, width, height)
+
+    series = []
+    for label, data in ((label_1, data_1), (label_2, data_2)):
+        years = [item["year"] for item in data]
+        values = [item["value"] for item in data]
+        years, values = downsample(width, dpi, years, values)
+        series.append({"name": label, "x": years, "y": _cents(values)})
+
+    return _spec(
+        "Strategy Comparison",
+        series,
+        annotations=[_end_label(s["name"], s["x"], s["y"]) for s in series]
+    )
+
+
+def fan_chart_spec(
+    yearly_percentiles: dict,
+    title: str = "Projected Value Range",
+    dpi: int = 100,
+    width: float = 6.4,
+    height: float = 4.8
+):
+    """Same chart as generate_fan_chart, as a JSON description."""
+    validate_output(SPEC_FORMAT, dpi, width, height)
+
+    years, p10, p50, p90 = downsample(
+        width,
+        dpi,
+        yearly_percentiles["year"],
+        yearly_percentiles["p10"],
+        yearly_percentiles["p50"],
+        yearly_percentiles["p90"]
+    )
+
+    return _spec(
+        title,
+        [{"name": "Median", "x": years, "y": _cents(p50)}],
+        bands=[{"name": "10th–90th percentile", "x": years, "low": _cents(p10), "high": _cents(p90)}],
+        annotations=[_end_label("Median", years, _cents(p50))]
+    )
@@ -1,29 +1,33 @@
-from utils import generate_base64_plot
-import matplotlib.pyplot as plt
+from utils import new_figure, generate_base64_plot, validate_output, downsample
 
 
 def generate_comparison_chart(
     data_1: list,
     data_2: list,
     label_1: str,
-    label_2: str
+    label_2: str,
+    format: str = "png",
+    dpi: int = 100,
+    width: float = 6.4,
+    height: float = 4.8
 ):
+    validate_output(format, dpi, width, height)
+
     years_1 = [item["year"] for item in data_1]
     values_1 = [item["value"] for item in data_1]
+    years_1, values_1 = downsample(width, dpi, years_1, values_1)
 
     years_2 = [item["year"] for item in data_2]
     values_2 = [item["value"] for item in data_2]
+    years_2, values_2 = downsample(width, dpi, years_2, values_2)
 
-    plt.figure()
-    plt.plot(years_1, values_1)
-    plt.plot(years_2, values_2)
-
-    plt.xlabel("Year")
-    plt.ylabel("Portfolio Value")
-    plt.title("Strategy Comparison")
+    fig = new_figure(width, height)
+    ax = fig.axes[0]
+    ax.plot(years_1, values_1)
+    ax.plot(years_2, values_2)
 
-    encoded = generate_base64_plot()
+    ax.set_xlabel("Year")
+    ax.set_ylabel("Portfolio Value")
+    ax.set_title("Strategy Comparison")
 
-    return {
-        "image_base64": encoded
-    }
+    return generate_base64_plot(fig, format, dpi)
@@ -0,0 +1,44 @@
+from utils import new_figure, generate_base64_plot, validate_output, downsample
+
+
+def generate_fan_chart(
+    yearly_percentiles: dict,
+    title: str = "Projected Value Range",
+    format: str = "png",
+    dpi: int = 100,
+    width: float = 6.4,
+    height: float = 4.8
+):
+    """
+    yearly_percentiles format (columnar, as returned by
+    monte_carlo_simulation with yearly_percentiles=True):
+    {
+        "year": [1, 2, ...],
+        "p10": [...],
+        "p50": [...],
+        "p90": [...]
+    }
+    """
+
+    validate_output(format, dpi, width, height)
+
+    years, p10, p50, p90 = downsample(
+        width,
+        dpi,
+        yearly_percentiles["year"],
+        yearly_percentiles["p10"],
+        yearly_percentiles["p50"],
+        yearly_percentiles["p90"]
+    )
+
+    fig = new_figure(width, height)
+    ax = fig.axes[0]
+    ax.fill_between(years, p10, p90, alpha=0.3, label="10th–90th percentile")
+    ax.plot(years, p50, label="Median")
+
+    ax.set_xlabel("Year")
+    ax.set_ylabel("Portfolio Value")
+    ax.set_title(title)
+    ax.legend()
+
+    return generate_base64_plot(fig, format, dpi)
@@ -1,8 +1,13 @@
-from utils import generate_base64_plot
-import matplotlib.pyplot as plt
+from utils import new_figure, generate_base64_plot, validate_output, downsample
 
 
-def generate_investment_growth_chart(yearly_data: list):
+def generate_investment_growth_chart(
+    yearly_data: list,
+    format: str = "png",
+    dpi: int = 100,
+    width: float = 6.4,
+    height: float = 4.8
+):
     """
     yearly_data format:
     [
@@ -10,24 +15,17 @@ def generate_investment_growth_chart(yearly_data: list):
         {"year": 2, "value": 120000}
     ]
     """
+    validate_output(format, dpi, width, height)
 
     years = [item["year"] for item in yearly_data]
+    values = [item["value"] for item in yearly_data]
+    years, values = downsample(width, dpi, years, values)
 
-    # If SIP simulation → value key exists
-    if "value" in yearly_data[0]:
-        values = [item["value"] for item in yearly_data]
-    else:
-        # SIP simulation format
-        values = [item["value"] for item in yearly_data]
+    fig = new_figure(width, height)
+    ax = fig.axes[0]
+    ax.plot(years, values)
+    ax.set_xlabel("Year")
+    ax.set_ylabel("Portfolio Value")
+    ax.set_title("Investment Growth")
 
-    plt.figure()
-    plt.plot(years, values)
-    plt.xlabel("Year")
-    plt.ylabel("Portfolio Value")
-    plt.title("Investment Growth")
-
-    encoded = generate_base64_plot()
-
-    return {
-        "image_base64": encoded
-    }
+    return generate_base64_plot(fig, format, dpi)
@@ -1,16 +1,78 @@
-import matplotlib
-matplotlib.use("Agg")
-
 import io
 import base64
-import matplotlib.pyplot as plt
+from typing import TYPE_CHECKING
+
+# matplotlib is imported on first render, not at server start, so the
+# server process itself never pays for it when rendering in workers.
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+MEDIA_TYPES = {
+    "png": "image/png",
+    "svg": "image/svg+xml",
+    "webp": "image/webp"
+}
+# Fixed seed for SVG element ids, so renders are byte-for-byte repeatable
+SVG_HASH_SALT = "finance-ai-chart"
+# Returns a JSON chart description for the browser to draw instead of an image
+SPEC_FORMAT = "spec"
+MIN_DPI, MAX_DPI = 50, 300
+MIN_INCHES, MAX_INCHES = 2, 20
+# A line needs no more points than about one per few pixels of width
+PIXELS_PER_POINT = 4
+
+
+def validate_output(format: str, dpi: int, width: float, height: float):
+    if format not in MEDIA_TYPES and format != SPEC_FORMAT:
+        raise ValueError(f"format must be one of {', '.join(MEDIA_TYPES)}, {SPEC_FORMAT}.")
+    if not MIN_DPI <= dpi <= MAX_DPI:
+        raise ValueError(f"dpi must be between {MIN_DPI} and {MAX_DPI}.")
+    if not (MIN_INCHES <= width <= MAX_INCHES and MIN_INCHES <= height <= MAX_INCHES):
+        raise ValueError(f"width and height must be between {MIN_INCHES} and {MAX_INCHES} inches.")
+
+
+def downsample(width: float, dpi: int, x: list, *series: list):
+    """
+    Thin evenly spaced points out of series too long to show at this size.
+
+    The first and last points are always kept. Returns (x, *series).
+    """
+    max_points = max(2, int(width * dpi / PIXELS_PER_POINT))
+    if len(x) <= max_points:
+        return (x, *series)
+
+    step = (len(x) - 1) / (max_points - 1)
+    keep = sorted({round(i * step) for i in range(max_points)})
+    return tuple([values[i] for i in keep] for values in (x, *series))
+
+
+def new_figure(width: float = 6.4, height: float = 4.8) -> "Figure":
+    """
+    A standalone figure with one set of axes.
+
+    Figures built this way are not registered with pyplot, so concurrent
+    renders never share global state and nothing needs closing.
+    """
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(width, height))
+    fig.add_subplot()
+    return fig
+
 
+def generate_base64_plot(fig: "Figure", format: str = "png", dpi: int = 100) -> dict:
+    import matplotlib
 
-def generate_base64_plot():
     buffer = io.BytesIO()
-    plt.savefig(buffer, format="png")
-    buffer.seek(0)
-    encoded = base64.b64encode(buffer.read()).decode("utf-8")
-    buffer.close()
-    plt.close()
-    return encoded
+    if format == "svg":
+        # SVGs carry a timestamp and element ids salted with a random uuid;
+        # drop the one and fix the other so identical charts produce
+        # identical bytes (and one chart store entry).
+        with matplotlib.rc_context({"svg.hashsalt": SVG_HASH_SALT}):
+            fig.savefig(buffer, format=format, dpi=dpi, metadata={"Date": None})
+    else:
+        fig.savefig(buffer, format=format, dpi=dpi)
+    return {
+        "image_base64": base64.b64encode(buffer.getvalue()).decode("utf-8"),
+        "media_type": MEDIA_TYPES[format]
+    }
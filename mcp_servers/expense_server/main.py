@@ -1,5 +1,6 @@
 from fastmcp import FastMCP
 from logger import setup_logger
+from utils import PURE_TOOL
 from tools import (
     calculate_savings_rate,
     calculate_emergency_fund,
@@ -11,7 +12,7 @@ logger = setup_logger()
 mcp = FastMCP("Expense & Budget Server")
 
 
-@mcp.tool()
+@mcp.tool(annotations=PURE_TOOL)
 def calculate_savings_rate_tool(
     monthly_income: float,
     monthly_expenses: float
@@ -23,7 +24,7 @@ def calculate_savings_rate_tool(
     )
 
 
-@mcp.tool()
+@mcp.tool(annotations=PURE_TOOL)
 def calculate_emergency_fund_tool(
     monthly_expenses: float,
     months: int = 6
@@ -35,7 +36,7 @@ def calculate_emergency_fund_tool(
     )
 
 
-@mcp.tool()
+@mcp.tool(annotations=PURE_TOOL)
 def estimate_investment_capacity_tool(
     monthly_income: float,
     monthly_expenses: float,
@@ -51,7 +52,7 @@ def estimate_investment_capacity_tool(
     )
 
 
-@mcp.tool()
+@mcp.tool(annotations=PURE_TOOL)
 def check_retirement_affordability_tool(
     current_savings: float,
     required_corpus: float
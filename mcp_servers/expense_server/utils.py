@@ -1,5 +1,9 @@
 from functools import wraps
 
+# Annotations for deterministic tools (same arguments -> same result).
+# The orchestrator only caches results of tools marked this way.
+PURE_TOOL = {"readOnlyHint": True, "idempotentHint": True}
+
 
 def validate_positive(value: float, field_name: str):
     if value < 0:
@@ -1,10 +1,14 @@
+import asyncio
 from fastmcp import FastMCP
 from logger import setup_logger
+from utils import PURE_TOOL
 from tools import (
     simulate_sip_growth,
     simulate_lump_sum_growth,
     simulate_step_up_sip,
-    simulate_portfolio_allocation
+    simulate_portfolio_allocation,
+    sweep_portfolio_allocation,
+    simulate_multi_asset_portfolio
 )
 
 logger = setup_logger()
@@ -15,83 +19,113 @@ mcp = FastMCP("Investment Simulation Server")
 # Tool Wrappers With Logging
 # ==========================
 
-@mcp.tool()
+# Every simulator takes granularity "monthly" (monthly instalments
+# compounded at annual_return / 12, matching math_server's SIP) or "yearly"
+# (compounded once a year). SIP tools default to monthly, lump-sum and
+# portfolio tools to yearly. Horizons run up to 100 years; monthly runs
+# also return every month as columnar `monthly_data` with include_monthly.
+
+@mcp.tool(annotations=PURE_TOOL)
 def simulate_sip_growth_tool(
     monthly_investment: float,
     annual_return: float,
-    years: int
+    years: int,
+    granularity: str = "monthly",
+    include_monthly: bool = False
 ):
+    """
+    Invests monthly and compounds at annual_return / 12 by default, the
+    same as calculate_sip_future_value. granularity="yearly" gives the
+    older once-a-year results.
+    """
     logger.info(
         f"SIP simulation requested | monthly={monthly_investment}, "
-        f"return={annual_return}, years={years}"
+        f"return={annual_return}, years={years}, granularity={granularity}"
     )
 
     result = simulate_sip_growth(
         monthly_investment,
         annual_return,
-        years
+        years,
+        granularity,
+        include_monthly
     )
 
     logger.info("SIP simulation completed")
     return result
 
 
-@mcp.tool()
+@mcp.tool(annotations=PURE_TOOL)
 def simulate_lump_sum_growth_tool(
     initial_investment: float,
     annual_return: float,
-    years: int
+    years: int,
+    granularity: str = "yearly",
+    include_monthly: bool = False
 ):
     logger.info(
         f"Lump sum simulation requested | initial={initial_investment}, "
-        f"return={annual_return}, years={years}"
+        f"return={annual_return}, years={years}, granularity={granularity}"
     )
 
     result = simulate_lump_sum_growth(
         initial_investment,
         annual_return,
-        years
+        years,
+        granularity,
+        include_monthly
     )
 
     logger.info("Lump sum simulation completed")
     return result
 
 
-@mcp.tool()
+@mcp.tool(annotations=PURE_TOOL)
 def simulate_step_up_sip_tool(
     monthly_investment: float,
     annual_step_up_percent: float,
     annual_return: float,
-    years: int
+    years: int,
+    granularity: str = "monthly",
+    include_monthly: bool = False
 ):
+    """
+    Invests monthly and compounds at annual_return / 12 by default, with
+    the instalment stepped up once a year. granularity="yearly" gives the
+    older once-a-year results.
+    """
     logger.info(
         f"Step-up SIP requested | monthly={monthly_investment}, "
-        f"step_up={annual_step_up_percent}, return={annual_return}, years={years}"
+        f"step_up={annual_step_up_percent}, return={annual_return}, years={years}, granularity={granularity}"
     )
 
     result = simulate_step_up_sip(
         monthly_investment,
         annual_step_up_percent,
         annual_return,
-        years
+        years,
+        granularity,
+        include_monthly
     )
 
     logger.info("Step-up SIP simulation completed")
     return result
 
 
-@mcp.tool()
+@mcp.tool(annotations=PURE_TOOL)
 def simulate_portfolio_allocation_tool(
     initial_investment: float,
     equity_percent: float,
     equity_return: float,
     debt_return: float,
-    years: int
+    years: int,
+    granularity: str = "yearly",
+    include_monthly: bool = False
 ):
     logger.info(
         f"Portfolio simulation requested | initial={initial_investment}, "
         f"equity%={equity_percent}, equity_return={equity_return}, "
-        f"debt_return={debt_return}, years={years}"
+        f"debt_return={debt_return}, years={years}, granularity={granularity}"
     )
 
     result = simulate_portfolio_allocation(
@@ -99,13 +133,107 @@ def simulate_portfolio_allocation_tool(
         equity_percent,
         equity_return,
         debt_return,
-        years
+        years,
+        granularity,
+        include_monthly
     )
 
     logger.info("Portfolio simulation completed")
     return result
 
 
+@mcp.tool(annotations=PURE_TOOL)
+def sweep_portfolio_allocation_tool(
+    initial_investment: float,
+    equity_return: float | list[float] | dict,
+    debt_return: float | list[float] | dict,
+    years: int,
+    equity_percent: float | list[float] | dict | None = None,
+    granularity: str = "yearly"
+):
+    """
+    Compare many equity/debt splits in one call.
+
+    equity_percent: splits to evaluate as a number, a list such as
+    [40, 60, 80] or an inclusive range such as {"start": 0, "stop": 100,
+    "step": 10}; defaults to 0-100 in steps of 5.
+    equity_return / debt_return: one assumption or several, in the same
+    forms; every combination is a separate scenario.
+    Returns final values and yearly paths per split for each scenario.
+    """
+    logger.info(
+        f"Allocation sweep requested | initial={initial_investment}, "
+        f"equity%={equity_percent}, equity_return={equity_return}, "
+        f"debt_return={debt_return}, years={years}, granularity={granularity}"
+    )
+
+    result = sweep_portfolio_allocation(
+        initial_investment,
+        equity_return,
+        debt_return,
+        years,
+        equity_percent,
+        granularity
+    )
+
+    logger.info("Allocation sweep completed")
+    return result
+
+
+@mcp.tool()
+async def simulate_multi_asset_portfolio_tool(
+    initial_investment: float,
+    weights: list[float],
+    years: int,
+    monthly_investment: float = 0.0,
+    expected_returns: list[float] | None = None,
+    volatilities: list[float] | None = None,
+    correlation: list[list[float]] | None = None,
+    assets: list[str] | None = None,
+    rebalance_every_years: int = 1,
+    simulations: int = 10000,
+    seed: int | None = None
+):
+    """
+    Stochastic projection of a multi-asset portfolio (equity, debt, gold
+    by default) with correlated yearly returns, monthly SIP contributions
+    and periodic rebalancing.
+
+    weights: target allocation in percent, e.g. [60, 30, 10].
+    expected_returns / volatilities: annual percent per asset (returns
+    compounded monthly, as in simulate_sip_growth_tool);
+    correlation: asset correlation matrix. All default to long-run
+    figures for equity, debt and gold when three weights are given.
+    rebalance_every_years: 0 never rebalances.
+    Returns final-value percentiles, drawdown statistics and
+    yearly_percentiles ready for generate_fan_chart_tool.
+    """
+    logger.info(
+        f"Multi-asset simulation requested | initial={initial_investment}, "
+        f"monthly={monthly_investment}, weights={weights}, years={years}, "
+        f"rebalance_every={rebalance_every_years}, simulations={simulations}"
+    )
+
+    # Run off the event loop so the server keeps serving other calls.
+    result = await asyncio.to_thread(
+        simulate_multi_asset_portfolio,
+        initial_investment,
+        weights,
+        years,
+        monthly_investment,
+        expected_returns,
+        volatilities,
+        correlation,
+        assets,
+        rebalance_every_years,
+        simulations,
+        seed
+    )
+
+    logger.info("Multi-asset simulation completed")
+    return result
+
+
 # ==========================
 # Server Start
 # ==========================
@@ -0,0 +1,85 @@
+import numpy as np
+
+MAX_YEARS = 100
+PERIODS_PER_YEAR = {"monthly": 12, "yearly": 1}
+
+
+def periods(years: int, granularity: str) -> int:
+    """Number of compounding periods, validating the horizon and granularity."""
+    if granularity not in PERIODS_PER_YEAR:
+        raise ValueError(f"granularity must be one of {', '.join(PERIODS_PER_YEAR)}.")
+    if not 1 <= years <= MAX_YEARS:
+        raise ValueError(f"years must be between 1 and {MAX_YEARS}.")
+    return int(years) * PERIODS_PER_YEAR[granularity]
+
+
+def periodic_rate(annual_return, granularity: str):
+    """
+    Return per period, in the convention math_server uses for SIPs:
+    the nominal annual rate split evenly across months.
+    """
+    annual_return = np.asarray(annual_return, dtype=float)
+    if np.any(annual_return <= -100):
+        raise ValueError("annual_return must be greater than -100.")
+    return annual_return / 100 / PERIODS_PER_YEAR[granularity]
+
+
+def contributions(
+    monthly_investment: float,
+    years: int,
+    granularity: str,
+    annual_step_up_percent: float = 0.0
+) -> np.ndarray:
+    """
+    Amount invested at the start of each period, stepped up once a year.
+    Yearly granularity invests a year's instalments at once.
+    """
+    per_year = PERIODS_PER_YEAR[granularity]
+    year_index = np.arange(periods(years, granularity)) // per_year
+    step_up = (1 + annual_step_up_percent / 100) ** year_index
+    return monthly_investment * (12 / per_year) * step_up
+
+
+def grow(rate, n: int, initial=0.0, deposits: np.ndarray | None = None) -> np.ndarray:
+    """
+    Value at the end of each of `n` periods.
+
+    With G_t the cumulative growth factor, a deposit made at the start of
+    period k is worth c_k * G_t / G_(k-1) at the end of period t, so
+
+        value_t = G_t * (initial + sum_{k<=t} c_k / G_(k-1))
+
+    which is one cumulative product and one cumulative sum, not a loop.
+    `rate` and `initial` may be arrays; the periods run along the last axis.
+    """
+    rate = np.asarray(rate, dtype=float)[..., None]
+    growth = np.cumprod(np.broadcast_to(1 + rate, rate.shape[:-1] + (n,)), axis=-1)
+    balance = np.asarray(initial, dtype=float)[..., None]
+    if deposits is not None:
+        opening = np.concatenate([np.ones_like(growth[..., :1]), growth[..., :-1]], axis=-1)
+        balance = balance + np.cumsum(deposits / opening, axis=-1)
+    return growth * balance
+
+
+def to_output(granularity: str, include_monthly: bool = False, **columns: np.ndarray) -> dict:
+    """
+    `yearly_data` rows at each year end, as the chart tools expect, plus,
+    when asked for at monthly granularity, every month as columnar
+    `monthly_data` (12 × years values per column, so off by default).
+    """
+    per_year = PERIODS_PER_YEAR[granularity]
+    rounded = {name: np.round(values, 2) for name, values in columns.items()}
+    year_ends = {name: values[per_year - 1::per_year].tolist() for name, values in rounded.items()}
+    n = len(next(iter(rounded.values())))
+
+    yearly_data = [
+        {"year": i + 1, **{name: values[i] for name, values in year_ends.items()}}
+        for i in range(n // per_year)
+    ]
+    output = {"granularity": granularity, "yearly_data": yearly_data}
+    if include_monthly and per_year > 1:
+        output["monthly_data"] = {
+            "month": list(range(1, n + 1)),
+            **{name: values.tolist() for name, values in rounded.items()}
+        }
+    return output
@@ -1,4 +1,6 @@
 from .sip_simulation import simulate_sip_growth
 from .lump_sum_simulation import simulate_lump_sum_growth
 from .step_up_sip import simulate_step_up_sip
-from .portfolio_simulation import simulate_portfolio_allocation
\ No newline at end of file
+from .portfolio_simulation import simulate_portfolio_allocation
+from .allocation_sweep import sweep_portfolio_allocation
+from .multi_asset_simulation import simulate_multi_asset_portfolio
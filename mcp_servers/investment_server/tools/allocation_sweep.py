@@ -0,0 +1,88 @@
+import numpy as np
+from utils import validate_positive, safe_tool
+from series import periods, periodic_rate, grow, PERIODS_PER_YEAR
+
+MAX_SWEEP_PATHS = 1_000
+DEFAULT_SPLITS = {"start": 0, "stop": 100, "step": 5}
+
+
+def _expand(name: str, spec) -> np.ndarray:
+    """
+    Turn a parameter spec into a 1-D array of values.
+
+    Accepts a scalar, a list of values, or an inclusive range
+    {"start": 0, "stop": 100, "step": 5}.
+    """
+    if isinstance(spec, dict):
+        try:
+            start, stop, step = spec["start"], spec["stop"], spec.get("step", 1)
+        except KeyError:
+            raise ValueError(f"{name} range needs 'start' and 'stop'.")
+        if step <= 0 or stop < start:
+            raise ValueError(f"{name} range needs step > 0 and stop >= start.")
+        if (stop - start) / step + 1 > MAX_SWEEP_PATHS:
+            raise ValueError(f"{name} range has more than {MAX_SWEEP_PATHS} values.")
+        values = np.arange(start, stop + step / 2, step, dtype=float)
+    else:
+        values = np.atleast_1d(np.asarray(spec, dtype=float))
+
+    if values.ndim != 1 or values.size == 0:
+        raise ValueError(f"{name} must be a number, a list or a range.")
+    return values
+
+
+@safe_tool
+def sweep_portfolio_allocation(
+    initial_investment: float,
+    equity_return,
+    debt_return,
+    years: int,
+    equity_percent=None,
+    granularity: str = "yearly"
+):
+    """
+    Evaluate many equity/debt splits, under one or more return
+    assumptions, in one vectorized pass.
+
+    Every combination of equity_return and debt_return is a scenario.
+    Each scenario holds `final_value` per split and `paths`, one row of
+    year-end values per split, in the order of `equity_percent`.
+    """
+    validate_positive(initial_investment, "initial_investment")
+
+    splits = _expand("equity_percent", DEFAULT_SPLITS if equity_percent is None else equity_percent)
+    if splits.min() < 0 or splits.max() > 100:
+        raise ValueError("equity_percent must be between 0 and 100.")
+    equity_returns = _expand("equity_return", equity_return)
+    debt_returns = _expand("debt_return", debt_return)
+
+    paths = splits.size * equity_returns.size * debt_returns.size
+    if paths > MAX_SWEEP_PATHS:
+        raise ValueError(f"Sweep has {paths} paths; the limit is {MAX_SWEEP_PATHS}.")
+
+    n = periods(years, granularity)
+    weights = splits / 100
+
+    # (equity returns, 1, splits, periods) + (1, debt returns, splits, periods)
+    equity = grow(periodic_rate(equity_returns, granularity)[:, None, None], n, initial_investment * weights)
+    debt = grow(periodic_rate(debt_returns, granularity)[None, :, None], n, initial_investment * (1 - weights))
+    per_year = PERIODS_PER_YEAR[granularity]
+    values = np.round((equity + debt)[..., per_year - 1::per_year], 2)
+
+    scenarios = [
+        {
+            "equity_return": float(equity_returns[i]),
+            "debt_return": float(debt_returns[j]),
+            "final_value": values[i, j, :, -1].tolist(),
+            "paths": values[i, j].tolist()
+        }
+        for i in range(equity_returns.size)
+        for j in range(debt_returns.size)
+    ]
+
+    return {
+        "granularity": granularity,
+        "equity_percent": splits.tolist(),
+        "years": list(range(1, int(years) + 1)),
+        "scenarios": scenarios
+    }
@@ -0,0 +1,220 @@
+import numpy as np
+from utils import validate_positive, safe_tool
+from series import MAX_YEARS
+
+PERCENTILES = (5, 10, 25, 50, 75, 90, 95)
+FAN_PERCENTILES = (10, 50, 90)
+DRAWDOWN_PERCENTILES = (50, 90, 95)
+
+# Caps the (paths × years) matrix of portfolio values (~80 MB of float64).
+MAX_PATH_YEARS = 10_000_000
+MAX_SIMULATIONS = 200_000
+
+# Used for any market input the caller leaves out (annual %, long-run
+# ballpark figures, not forecasts).
+DEFAULT_ASSETS = ("equity", "debt", "gold")
+DEFAULT_RETURNS = (12.0, 7.0, 9.0)
+DEFAULT_VOLATILITIES = (18.0, 4.0, 15.0)
+DEFAULT_CORRELATION = (
+    (1.0, 0.1, -0.1),
+    (0.1, 1.0, 0.2),
+    (-0.1, 0.2, 1.0)
+)
+
+
+def _log_return_model(expected_returns, volatilities, correlation):
+    """
+    Mean vector and Cholesky factor of yearly log returns.
+
+    Log returns are drawn from a multivariate normal whose parameters are
+    matched so each asset's simple return has the requested mean and
+    volatility and each pair the requested covariance
+    (rho_ij * vol_i * vol_j). Simple returns then stay above -100%.
+    """
+    gross = 1 + expected_returns
+    covariance = correlation * np.outer(volatilities, volatilities)
+    log_covariance = np.log1p(covariance / np.outer(gross, gross))
+    # Factor the correlation, not the covariance, so zero-volatility
+    # assets (a singular covariance) are still allowed.
+    log_volatility = np.sqrt(np.diag(log_covariance))
+    scale = np.where(log_volatility > 0, log_volatility, 1)
+    log_correlation = log_covariance / np.outer(scale, scale)
+    np.fill_diagonal(log_correlation, 1)
+    try:
+        cholesky = np.linalg.cholesky(log_correlation) * log_volatility[:, None]
+    except np.linalg.LinAlgError:
+        raise ValueError("correlation must be a valid (positive definite) correlation matrix.")
+    return np.log(gross) - log_volatility**2 / 2, cholesky
+
+
+def _percentiles(values: np.ndarray, percentiles) -> dict:
+    return {
+        f"p{p}": round(float(q), 2)
+        for p, q in zip(percentiles, np.percentile(values, percentiles))
+    }
+
+
+@safe_tool
+def simulate_multi_asset_portfolio(
+    initial_investment: float,
+    weights: list,
+    years: int,
+    monthly_investment: float = 0.0,
+    expected_returns: list | None = None,
+    volatilities: list | None = None,
+    correlation: list | None = None,
+    assets: list | None = None,
+    rebalance_every_years: int = 1,
+    simulations: int = 10_000,
+    seed: int | None = None
+):
+    """
+    Simulate a portfolio of correlated assets over many random paths.
+
+    Each year every path draws one correlated return per asset.
+    expected_returns are nominal annual rates compounded monthly, as in
+    simulate_sip_growth; volatilities apply to yearly returns.
+
+    monthly_investment is invested at the start of every month at the
+    target weights. Within a year each instalment earns its share of
+    that year's drawn return, compounded monthly (an annuity-due factor),
+    so with zero volatility the result equals simulate_sip_growth.
+    Holdings are reset to the target weights every
+    `rebalance_every_years` years (0 never rebalances).
+
+    Paths advance together one year at a time, so the work is a handful
+    of array operations per year regardless of `simulations`.
+
+    Returns percentiles of the final value, p10/p50/p90 bands per year
+    (the shape generate_fan_chart_tool expects) and drawdown statistics.
+    Drawdowns are measured on the time-weighted return, so contributions
+    do not hide losses. Yearly sampling misses dips within a year.
+    """
+    validate_positive(initial_investment, "initial_investment")
+    validate_positive(monthly_investment, "monthly_investment")
+    validate_positive(rebalance_every_years, "rebalance_every_years")
+    if not 1 <= years <= MAX_YEARS:
+        raise ValueError(f"years must be between 1 and {MAX_YEARS}.")
+    if not 1 <= simulations <= MAX_SIMULATIONS:
+        raise ValueError(f"simulations must be between 1 and {MAX_SIMULATIONS}.")
+    if simulations * years > MAX_PATH_YEARS:
+        raise ValueError(f"simulations × years must be at most {MAX_PATH_YEARS}.")
+    if initial_investment == 0 and monthly_investment == 0:
+        raise ValueError("initial_investment or monthly_investment must be positive.")
+
+    weights = np.asarray(weights, dtype=float)
+    n_assets = weights.size
+    market = (expected_returns, volatilities, correlation, assets)
+    if n_assets != len(DEFAULT_ASSETS) and any(value is None for value in market):
+        raise ValueError(
+            "expected_returns, volatilities, correlation and assets are required "
+            f"unless weights cover {', '.join(DEFAULT_ASSETS)}."
+        )
+
+    assets = list(assets if assets is not None else DEFAULT_ASSETS)
+    expected_returns = np.asarray(expected_returns if expected_returns is not None else DEFAULT_RETURNS, dtype=float) / 100
+    volatilities = np.asarray(volatilities if volatilities is not None else DEFAULT_VOLATILITIES, dtype=float) / 100
+    correlation = np.asarray(correlation if correlation is not None else DEFAULT_CORRELATION, dtype=float)
+
+    if weights.ndim != 1 or np.any(weights < 0) or not np.isclose(weights.sum(), 100):
+        raise ValueError("weights must be non-negative percentages summing to 100.")
+    if not (len(assets) == expected_returns.size == volatilities.size == n_assets):
+        raise ValueError("weights, assets, expected_returns and volatilities must have the same length.")
+    if np.any(expected_returns <= -1) or np.any(volatilities < 0):
+        raise ValueError("expected_returns must exceed -100 and volatilities must be non-negative.")
+    if (
+        correlation.shape != (n_assets, n_assets)
+        or not np.allclose(correlation, correlation.T)
+        or not np.allclose(np.diag(correlation), 1)
+        or np.any(np.abs(correlation) > 1)
+    ):
+        raise ValueError("correlation must be a symmetric matrix with ones on the diagonal.")
+
+    # Rates are nominal annual, compounded monthly as in the SIP tools
+    effective_returns = (1 + expected_returns / 12) ** 12 - 1
+    mean, cholesky = _log_return_model(effective_returns, volatilities, correlation)
+    targets = weights / 100
+    median_growth = np.exp(mean)
+    monthly_mean = (mean / 12).astype(np.float32)[:, None]
+    cholesky_32 = cholesky.astype(np.float32)
+    instalments = monthly_investment * targets[:, None]
+
+    # Asset-major layout: each asset's holdings across all paths are one
+    # contiguous row, so per-year sums are a few vector adds.
+    rng = np.random.default_rng(seed)
+    holdings = np.repeat(initial_investment * targets[:, None], simulations, axis=1)
+    values = np.empty((years, simulations))
+    # Time-weighted growth of one unit, its running peak and worst drop
+    unit = np.ones(simulations)
+    peak = np.ones(simulations)
+    max_drawdown = np.zeros(simulations)
+
+    for year in range(years):
+        start = holdings.sum(axis=0)
+
+        # float32 draws are about twice as fast and ample for the random
+        # part; the expected growth is applied in full precision.
+        shocks = cholesky_32 @ rng.standard_normal((n_assets, simulations), dtype=np.float32)
+        growth = np.exp(shocks) * median_growth[:, None]
+        holdings *= growth
+
+        # Time-weighted return of the holdings, leaving out this year's flows
+        grown = holdings.sum(axis=0)
+        if start.all():
+            unit *= grown / start
+        else:
+            # Nothing invested yet (SIP only): the target mix's return
+            funded = start > 0
+            unit *= np.where(
+                funded,
+                grown / np.where(funded, start, 1),
+                (targets[:, None] * growth).sum(axis=0)
+            )
+        np.maximum(peak, unit, out=peak)
+        np.maximum(max_drawdown, 1 - unit / peak, out=max_drawdown)
+
+        if monthly_investment:
+            # Instalment k of 12 grows by g^(13 - k), g = e^x the monthly
+            # growth: sum_{k=1..12} g^k = g (g^12 - 1) / (g - 1). expm1
+            # keeps this accurate for small x; x = 0 (no growth) gives 12.
+            shocks /= 12
+            shocks += monthly_mean
+            step = np.expm1(shocks)
+            annuity = np.expm1(12 * shocks)
+            with np.errstate(invalid="ignore"):
+                annuity /= step
+            annuity *= step + 1
+            np.nan_to_num(annuity, copy=False, nan=12.0)
+            holdings += instalments * annuity
+
+        end = holdings.sum(axis=0)
+        values[year] = end
+
+        if rebalance_every_years and (year + 1) % rebalance_every_years == 0:
+            holdings = targets[:, None] * end
+
+    final = values[-1]
+    total_invested = initial_investment + monthly_investment * 12 * years
+    bands = np.percentile(values, FAN_PERCENTILES, axis=1)
+
+    return {
+        "assets": assets,
+        "weights": weights.tolist(),
+        "total_invested": round(total_invested, 2),
+        "final_value": {
+            "median": round(float(np.median(final)), 2),
+            **_percentiles(final, PERCENTILES),
+            "mean": round(float(final.mean()), 2)
+        },
+        "probability_of_loss_percent": round(float(np.mean(final < total_invested)) * 100, 2),
+        "max_drawdown_percent": {
+            **_percentiles(max_drawdown * 100, DRAWDOWN_PERCENTILES),
+            "worst": round(float(max_drawdown.max()) * 100, 2)
+        },
+        "yearly_percentiles": {
+            "year": list(range(1, years + 1)),
+            **{f"p{p}": np.round(band, 2).tolist() for p, band in zip(FAN_PERCENTILES, bands)}
+        },
+        "simulations": simulations,
+        "seed": seed
+    }
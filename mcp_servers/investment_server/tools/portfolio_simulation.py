@@ -1,4 +1,5 @@
 from utils import validate_positive, safe_tool
+from series import periods, periodic_rate, grow, to_output
 
 @safe_tool
 def simulate_portfolio_allocation(
@@ -6,24 +7,14 @@ def simulate_portfolio_allocation(
     equity_percent: float,
     equity_return: float,
     debt_return: float,
-    years: int
+    years: int,
+    granularity: str = "yearly",
+    include_monthly: bool = False
 ):
     validate_positive(initial_investment, "initial_investment")
 
-    equity = initial_investment * (equity_percent / 100)
-    debt = initial_investment * (1 - equity_percent / 100)
+    n = periods(years, granularity)
+    equity = grow(periodic_rate(equity_return, granularity), n, initial_investment * (equity_percent / 100))
+    debt = grow(periodic_rate(debt_return, granularity), n, initial_investment * (1 - equity_percent / 100))
 
-    yearly_data = []
-
-    for year in range(1, years + 1):
-        equity *= (1 + equity_return / 100)
-        debt *= (1 + debt_return / 100)
-
-        total_value = equity + debt
-
-        yearly_data.append({
-            "year": year,
-            "portfolio_value": round(total_value, 2)
-        })
-
-    return {"yearly_data": yearly_data}
+    return to_output(granularity, include_monthly, portfolio_value=equity + debt)
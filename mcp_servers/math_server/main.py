@@ -1,5 +1,8 @@
-from fastmcp import FastMCP
+import asyncio
+import json
+from fastmcp import FastMCP, Context
 from logger import setup_logger
+from utils import PURE_TOOL
 from tools import (
     calculate_sip_future_value as sip_logic,
     calculate_emi as emi_logic,
@@ -9,7 +12,8 @@ from tools import (
     retirement_corpus_required as retirement_logic,
     required_sip_for_goal as goal_sip_logic,
     calculate_cagr as cagr_logic,
-    monte_carlo_simulation as mc_logic
+    monte_carlo_simulation as mc_logic,
+    scenario_grid as grid_logic
 )
 
 logger = setup_logger()
@@ -20,7 +24,7 @@ mcp = FastMCP("Financial Math Server")
 # Tool Wrappers (Decorator Style)
 # =============================
 
-@mcp.tool()
+@mcp.tool(annotations=PURE_TOOL)
 def calculate_sip_future_value(
     monthly_investment: float,
     annual_return: float,
@@ -34,7 +38,7 @@ def calculate_sip_future_value(
     )
 
 
-@mcp.tool()
+@mcp.tool(annotations=PURE_TOOL)
 def calculate_emi(
     principal: float,
     annual_rate: float,
@@ -44,17 +48,18 @@ def calculate_emi(
     return emi_logic(principal, annual_rate, years)
 
 
-@mcp.tool()
+@mcp.tool(annotations=PURE_TOOL)
 def generate_amortization_schedule(
     principal: float,
     annual_rate: float,
-    years: int
+    years: int,
+    view: str = "yearly"
 ):
-    logger.info("Amortization schedule requested")
-    return amort_logic(principal, annual_rate, years)
+    logger.info(f"Amortization schedule requested | view={view}")
+    return amort_logic(principal, annual_rate, years, view)
 
 
-@mcp.tool()
+@mcp.tool(annotations=PURE_TOOL)
 def inflation_adjusted_value(
     present_value: float,
     inflation_rate: float,
@@ -64,7 +69,7 @@ def inflation_adjusted_value(
     return inflation_logic(present_value, inflation_rate, years)
 
 
-@mcp.tool()
+@mcp.tool(annotations=PURE_TOOL)
 def real_rate_of_return(
     nominal_return: float,
     inflation_rate: float
@@ -73,7 +78,7 @@ def real_rate_of_return(
     return real_return_logic(nominal_return, inflation_rate)
 
 
-@mcp.tool()
+@mcp.tool(annotations=PURE_TOOL)
 def retirement_corpus_required(
     annual_expense: float,
     years_after_retirement: int,
@@ -87,7 +92,7 @@ def retirement_corpus_required(
     )
 
 
-@mcp.tool()
+@mcp.tool(annotations=PURE_TOOL)
 def required_sip_for_goal(
     target_amount: float,
     annual_return: float,
@@ -101,7 +106,7 @@ def required_sip_for_goal(
     )
 
 
-@mcp.tool()
+@mcp.tool(annotations=PURE_TOOL)
 def calculate_cagr(
     initial_value: float,
     final_value: float,
@@ -116,23 +121,70 @@ def calculate_cagr(
 
 
 @mcp.tool()
-def monte_carlo_simulation(
+async def monte_carlo_simulation(
     initial_investment: float,
     annual_return: float,
     volatility: float,
     years: int,
-    simulations: int = 1000
+    ctx: Context,
+    simulations: int = 1000,
+    seed: int | None = None,
+    workers: int = 1,
+    accuracy: float | None = None,
+    convergence_tolerance: float | None = None,
+    yearly_percentiles: bool = False
 ):
-    logger.info("Monte Carlo simulation requested")
-    return mc_logic(
+    logger.info(
+        f"Monte Carlo simulation requested | simulations={simulations}, "
+        f"workers={workers}, accuracy={accuracy}, "
+        f"convergence_tolerance={convergence_tolerance}"
+    )
+    loop = asyncio.get_running_loop()
+
+    def report_progress(completed: int, total: int, interim: dict):
+        # Called from the simulation thread after every batch; interim
+        # percentiles travel as the JSON progress message.
+        asyncio.run_coroutine_threadsafe(
+            ctx.report_progress(completed, total, json.dumps(interim)),
+            loop
+        )
+
+    # Run off the event loop so the server keeps serving other calls.
+    return await asyncio.to_thread(
+        mc_logic,
         initial_investment,
         annual_return,
         volatility,
         years,
-        simulations
+        simulations,
+        seed,
+        workers,
+        accuracy,
+        convergence_tolerance,
+        yearly_percentiles,
+        report_progress
     )
 
 
+@mcp.tool(annotations=PURE_TOOL)
+def scenario_grid(
+    calculation: str,
+    parameters: dict
+):
+    """
+    Evaluate many what-if scenarios in one call.
+
+    calculation: "sip_future_value" (monthly_investment, annual_return, years),
+    "emi" (principal, annual_rate, years) or
+    "required_sip" (target_amount, annual_return, years).
+    parameters: each input as a number, a list such as [7, 8, 9, 10], or an
+    inclusive range such as {"start": 10, "stop": 20, "step": 5}.
+    Every combination is evaluated and returned as a table.
+    """
+    logger.info(f"Scenario grid requested | calculation={calculation}")
+    return grid_logic(calculation, parameters)
+
+
 # =============================
 # Health Check Endpoint
 # =============================
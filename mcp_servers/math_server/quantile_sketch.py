@@ -0,0 +1,108 @@
+import math
+import numpy as np
+
+# Empirical single-quantile rank error of KLL at 99% confidence
+# (eps ≈ 2.296 / k^0.9723, as published with the Apache DataSketches KLL).
+_EPS_SCALE = 2.296
+_EPS_EXPONENT = 0.9723
+
+MIN_K = 8
+MAX_K = 65_535
+
+
+def k_for_accuracy(accuracy: float) -> int:
+    """Smallest sketch size `k` whose rank error is at most `accuracy`."""
+    if not 0 < accuracy < 1:
+        raise ValueError("accuracy must be between 0 and 1.")
+    k = math.ceil((_EPS_SCALE / accuracy) ** (1 / _EPS_EXPONENT))
+    return min(max(k, MIN_K), MAX_K)
+
+
+class KLLSketch:
+    """
+    Mergeable streaming quantile sketch (Karnin–Lang–Liberty).
+
+    Values are buffered on level 0; when a level overflows it is sorted and
+    every other item (random offset) is promoted to the next level with
+    double weight. Memory stays O(k) regardless of how many values are fed
+    in, and sketches built on disjoint streams can be merged losslessly.
+    """
+
+    def __init__(self, k: int = 200, seed=None):
+        if k < MIN_K:
+            raise ValueError(f"k must be at least {MIN_K}.")
+        self.k = k
+        self.count = 0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    @property
+    def is_exact(self) -> bool:
+        """True while no compaction has happened (all values retained)."""
+        return len(self.levels) == 1
+
+    @property
+    def rank_error(self) -> float:
+        """Normalized rank error bound of `quantiles` (0 when exact)."""
+        if self.is_exact:
+            return 0.0
+        return _EPS_SCALE / self.k ** _EPS_EXPONENT
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, math.ceil(self.k * (2 / 3) ** depth))
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        self.count += values.size
+        self.levels[0] = np.concatenate((self.levels[0], values))
+        self._compress()
+
+    def merge(self, other: "KLLSketch"):
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate((self.levels[level], items))
+        self.count += other.count
+        self._compress()
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if items.size <= self._capacity(level):
+                level += 1
+                continue
+
+            if level + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+
+            items = np.sort(items)
+            # An odd item stays behind so total weight is conserved exactly.
+            kept = items[items.size - items.size % 2:]
+            offset = int(self._rng.integers(2))
+            promoted = items[offset:items.size - items.size % 2:2]
+
+            self.levels[level] = kept
+            self.levels[level + 1] = np.concatenate((self.levels[level + 1], promoted))
+            # Growing the hierarchy shrinks lower capacities; rescan from the bottom.
+            level = 0
+
+    def quantiles(self, fractions) -> np.ndarray:
+        """Approximate values at the given quantile fractions (0..1)."""
+        if self.count == 0:
+            raise ValueError("Cannot compute quantiles of an empty sketch.")
+
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([
+            np.full(items.size, 2 ** level, dtype=np.int64)
+            for level, items in enumerate(self.levels)
+        ])
+
+        order = np.argsort(values, kind="stable")
+        values = values[order]
+        cumulative = np.cumsum(weights[order])
+
+        targets = np.asarray(fractions, dtype=float) * cumulative[-1]
+        index = np.searchsorted(cumulative, targets, side="left")
+        return values[np.minimum(index, values.size - 1)]
@@ -2,4 +2,5 @@ from .sip import calculate_sip_future_value
 from .loan import calculate_emi, generate_amortization_schedule
 from .inflation import inflation_adjusted_value, real_rate_of_return
 from .retirement import retirement_corpus_required, required_sip_for_goal
-from .advanced import calculate_cagr, monte_carlo_simulation
\ No newline at end of file
+from .advanced import calculate_cagr, monte_carlo_simulation
+from .scenario_grid import scenario_grid
@@ -1,6 +1,36 @@
-import random
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from quantile_sketch import KLLSketch, k_for_accuracy
 from utils import validate_positive, safe_tool
 
+PERCENTILES = (5, 10, 25, 50, 75, 90, 95)
+
+# Upper bound on random draws held in memory at once (~16 MB of float64).
+MAX_CHUNK_ELEMENTS = 2_000_000
+MAX_SIMULATIONS = 10_000_000
+
+MAX_WORKERS = os.cpu_count() or 1
+DEFAULT_ACCURACY = 0.01
+
+# Interim results are reported after each of ~PROGRESS_BATCHES batches.
+PROGRESS_BATCHES = 20
+MIN_BATCH_PATHS = 10_000
+CONVERGENCE_QUANTILES = (0.1, 0.5, 0.9)
+
+# Per-year fan bands. Exact storage of kept values (simulations, times
+# years with yearly bands) is capped; past the cap even a single-worker
+# run is tracked with quantile sketches, so its percentiles are
+# approximate and quantile_rank_error is nonzero.
+FAN_PERCENTILES = (10, 50, 90)
+MAX_EXACT_FAN_ELEMENTS = 5_000_000
+
+_pool: ProcessPoolExecutor | None = None
+_this_module = sys.modules[__name__]
+
+
 @safe_tool
 def calculate_cagr(
     initial_value: float,
@@ -15,30 +45,301 @@ def calculate_cagr(
     return {"cagr_percent": round(cagr, 2)}
 
 
+def _chunk_sizes(simulations: int, years: int):
+    """Split `simulations` paths into chunks of bounded (paths × years) size."""
+    rows = max(1, MAX_CHUNK_ELEMENTS // max(years, 1))
+    for start in range(0, simulations, rows):
+        yield min(rows, simulations - start)
+
+
+def _simulate_values(
+    rng: np.random.Generator,
+    initial_investment: float,
+    annual_return: float,
+    volatility: float,
+    years: int,
+    paths: int,
+    yearly: bool = False
+) -> np.ndarray:
+    """
+    Draw a (paths × years) matrix of returns and compound each row.
+
+    Returns a (paths × 1) matrix of terminal values, or the full
+    (paths × years) matrix of year-end values when `yearly` is set.
+    """
+    growth = rng.normal(annual_return / 100, volatility / 100, size=(paths, years))
+    growth += 1.0
+    if yearly:
+        np.cumprod(growth, axis=1, out=growth)
+        growth *= initial_investment
+        return growth
+    return initial_investment * growth.prod(axis=1, keepdims=True)
+
+
+def _pool_available() -> bool:
+    """
+    Worker processes find `_simulate_partition` by module name. When this
+    server is mounted inside another process its modules are not importable
+    under that name, so partitions then run in the calling process.
+    """
+    return sys.modules.get(__name__) is _this_module
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Lazily start the shared worker pool used by parallel simulations."""
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=MAX_WORKERS)
+    return _pool
+
+
+def _simulate_partition(
+    seed_sequence: np.random.SeedSequence,
+    initial_investment: float,
+    annual_return: float,
+    volatility: float,
+    years: int,
+    paths: int,
+    k: int,
+    yearly: bool
+):
+    """
+    Simulate one partition of paths into quantile sketches.
+
+    Runs inside a pool worker; only the sketches and two scalars are sent
+    back, so memory is bounded by the chunk size and `k`, not by `paths`.
+    """
+    path_seed, sketch_seed = seed_sequence.spawn(2)
+    rng = np.random.default_rng(path_seed)
+    columns = years if yearly else 1
+    aggregate = _PathValues(paths, columns, initial_investment, k, sketch_seed)
+
+    for chunk in _chunk_sizes(paths, years):
+        aggregate.add_values(_simulate_values(
+            rng, initial_investment, annual_return, volatility, years, chunk, yearly
+        ))
+
+    return aggregate.sketches, aggregate.total, aggregate.losses
+
+
+def _summarize(quantiles, mean: float, loss_fraction: float) -> dict:
+    summary = {f"p{p}": round(float(q), 2) for p, q in zip(PERCENTILES, quantiles)}
+    return {
+        "median": summary["p50"],
+        **summary,
+        "mean": round(mean, 2),
+        "probability_of_loss_percent": round(loss_fraction * 100, 2)
+    }
+
+
+def _batch_sizes(simulations: int):
+    """Split a run into roughly PROGRESS_BATCHES reporting batches."""
+    size = max(MIN_BATCH_PATHS, -(-simulations // PROGRESS_BATCHES))
+    for start in range(0, simulations, size):
+        yield min(size, simulations - start)
+
+
+class _PathValues:
+    """
+    Running aggregate of simulated values, one column per tracked year.
+
+    Keeps every value when `k` is None (exact percentiles), otherwise folds
+    each column into its own KLL sketch so memory stays constant. The last
+    column holds terminal values, which drive mean and loss statistics.
+    """
+
+    def __init__(self, simulations: int, columns: int, initial_investment: float,
+                 k: int | None = None, seed=None):
+        self.initial_investment = initial_investment
+        if k:
+            seed = seed if seed is not None else np.random.SeedSequence()
+            self.sketches = [KLLSketch(k, seed=s) for s in seed.spawn(columns)]
+            self.values = None
+        else:
+            self.sketches = None
+            self.values = np.empty((simulations, columns))
+        self.count = 0
+        self.total = 0.0
+        self.losses = 0
+
+    def add_values(self, values: np.ndarray):
+        if self.sketches:
+            for sketch, column in zip(self.sketches, values.T):
+                sketch.update(column)
+        else:
+            self.values[self.count:self.count + len(values)] = values
+
+        terminal = values[:, -1]
+        self.count += len(values)
+        self.total += float(terminal.sum())
+        self.losses += int(np.count_nonzero(terminal < self.initial_investment))
+
+    def add_partial(self, sketches: list, total: float, losses: int):
+        for sketch, other in zip(self.sketches, sketches):
+            sketch.merge(other)
+        self.count += sketches[-1].count
+        self.total += total
+        self.losses += losses
+
+    @property
+    def rank_error(self) -> float:
+        return max(s.rank_error for s in self.sketches) if self.sketches else 0.0
+
+    def quantiles(self, fractions) -> np.ndarray:
+        """Quantiles of terminal values."""
+        if self.sketches:
+            return self.sketches[-1].quantiles(fractions)
+        return np.quantile(self.values[:self.count, -1], fractions)
+
+    def column_quantiles(self, fractions) -> np.ndarray:
+        """(len(fractions) × columns) matrix of quantiles for every column."""
+        if self.sketches:
+            return np.column_stack([s.quantiles(fractions) for s in self.sketches])
+        return np.quantile(self.values[:self.count], fractions, axis=0)
+
+    def summary(self) -> dict:
+        return _summarize(
+            self.quantiles([p / 100 for p in PERCENTILES]),
+            self.total / self.count,
+            self.losses / self.count
+        )
+
+    def yearly_bands(self) -> dict:
+        """Columnar per-year percentile bands, e.g. for a fan chart."""
+        bands = self.column_quantiles([p / 100 for p in FAN_PERCENTILES])
+        return {
+            "year": list(range(1, bands.shape[1] + 1)),
+            **{
+                f"p{p}": np.round(row, 2).tolist()
+                for p, row in zip(FAN_PERCENTILES, bands)
+            }
+        }
+
+
+def _has_converged(previous: np.ndarray, current: np.ndarray, tolerance: float) -> bool:
+    """True when every tracked quantile moved less than `tolerance` (relative)."""
+    change = np.abs(current - previous) / np.maximum(np.abs(previous), 1e-9)
+    return bool(np.all(change < tolerance))
+
+
 @safe_tool
 def monte_carlo_simulation(
     initial_investment: float,
     annual_return: float,
     volatility: float,
     years: int,
-    simulations: int = 1000
+    simulations: int = 1000,
+    seed: int | None = None,
+    workers: int = 1,
+    accuracy: float | None = None,
+    convergence_tolerance: float | None = None,
+    yearly_percentiles: bool = False,
+    progress_callback=None
 ):
+    """
+    Simulate terminal portfolio values under normally distributed returns.
+
+    With `workers=1`, no `accuracy` and at most MAX_EXACT_FAN_ELEMENTS
+    kept values (simulations, times years with `yearly_percentiles`),
+    every value is kept and percentiles are exact. Otherwise paths are
+    split across `workers` processes and percentiles come from a
+    mergeable KLL sketch with constant memory; `accuracy` is the target
+    normalized rank error, and `quantile_rank_error` in the result is
+    nonzero. Larger single-worker runs are sketched the same way.
+
+    Paths are simulated in batches. After each batch `progress_callback`
+    (if given) receives `(completed, total, interim_summary)`, and when
+    `convergence_tolerance` is set the run stops early once p10, median
+    and p90 all move by less than that relative amount between batches.
+
+    `yearly_percentiles` adds p10/p50/p90 bands for every year, computed
+    from the same paths and returned as columnar arrays.
+    """
     validate_positive(initial_investment, "initial_investment")
-    validate_positive(years, "years")
+    validate_positive(volatility, "volatility")
+    if years < 1:
+        raise ValueError("years must be at least 1.")
 
-    results = []
+    if simulations < 1 or simulations > MAX_SIMULATIONS:
+        raise ValueError(f"simulations must be between 1 and {MAX_SIMULATIONS}.")
+    if workers < 1:
+        raise ValueError("workers must be at least 1.")
+    if convergence_tolerance is not None and convergence_tolerance <= 0:
+        raise ValueError("convergence_tolerance must be positive.")
+    if accuracy is not None and not 0 < accuracy < 1:
+        raise ValueError("accuracy must be between 0 and 1.")
 
-    for _ in range(simulations):
-        value = initial_investment
-        for _ in range(years):
-            simulated_return = random.gauss(annual_return, volatility) / 100
-            value *= (1 + simulated_return)
-        results.append(value)
+    workers = min(workers, MAX_WORKERS, simulations)
+    columns = years if yearly_percentiles else 1
+    sketched = (
+        workers > 1
+        or accuracy is not None
+        or simulations * columns > MAX_EXACT_FAN_ELEMENTS
+    )
+    market = (initial_investment, annual_return, volatility, years)
 
-    results.sort()
+    root = np.random.SeedSequence(seed)
+    if sketched:
+        k = k_for_accuracy(DEFAULT_ACCURACY if accuracy is None else accuracy)
+        aggregate = _PathValues(simulations, columns, initial_investment, k, root.spawn(1)[0])
+    else:
+        rng = np.random.default_rng(root)
+        aggregate = _PathValues(simulations, columns, initial_investment)
 
-    return {
-        "median": round(results[len(results)//2], 2),
-        "p10": round(results[int(0.1*len(results))], 2),
-        "p90": round(results[int(0.9*len(results))], 2)
+    track_quantiles = progress_callback is not None or convergence_tolerance is not None
+    previous = None
+    converged = False
+
+    for batch in _batch_sizes(simulations):
+        if sketched:
+            # One independent, reproducible stream per worker per batch.
+            streams = root.spawn(workers)
+            partitions = [
+                batch // workers + (1 if i < batch % workers else 0)
+                for i in range(workers)
+            ]
+            args = [
+                (stream, *market, paths, k, yearly_percentiles)
+                for stream, paths in zip(streams, partitions)
+                if paths > 0
+            ]
+            if len(args) == 1 or not _pool_available():
+                partials = [_simulate_partition(*partition) for partition in args]
+            else:
+                partials = _get_pool().map(_simulate_partition, *zip(*args))
+            for partial in partials:
+                aggregate.add_partial(*partial)
+        else:
+            for paths in _chunk_sizes(batch, years):
+                aggregate.add_values(
+                    _simulate_values(rng, *market, paths, yearly_percentiles)
+                )
+
+        if not track_quantiles:
+            continue
+
+        current = aggregate.quantiles(CONVERGENCE_QUANTILES)
+        if progress_callback is not None:
+            progress_callback(aggregate.count, simulations, aggregate.summary())
+
+        if (
+            convergence_tolerance is not None
+            and previous is not None
+            and _has_converged(previous, current, convergence_tolerance)
+        ):
+            converged = aggregate.count < simulations
+            break
+        previous = current
+
+    result = {
+        **aggregate.summary(),
+        "simulations": simulations,
+        "simulations_run": aggregate.count,
+        "converged_early": converged,
+        "seed": seed,
+        "workers": workers,
+        "quantile_rank_error": round(aggregate.rank_error, 6)
     }
+    if yearly_percentiles:
+        result["yearly_percentiles"] = aggregate.yearly_bands()
+    return result
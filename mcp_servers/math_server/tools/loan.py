@@ -1,5 +1,16 @@
+import numpy as np
 from utils import validate_positive, safe_tool
 
+AMORTIZATION_VIEWS = ("summary", "yearly", "columnar")
+MAX_LOAN_YEARS = 100
+
+
+def _emi(principal: float, r: float, n: int) -> float:
+    if r == 0:
+        return principal / n
+    return principal * r * (1 + r)**n / ((1 + r)**n - 1)
+
+
 @safe_tool
 def calculate_emi(
     principal: float,
@@ -7,16 +18,13 @@ def calculate_emi(
     years: int
 ):
     validate_positive(principal, "principal")
-    validate_positive(annual_rate,"annual_rate")
-    validate_posoitive(years, "years")
+    validate_positive(annual_rate, "annual_rate")
+    validate_positive(years, "years")
 
-    r = annual / 100 / 12
+    r = annual_rate / 100 / 12
     n = years * 12
 
-    if r == 0:
-        emi = principal / n
-    else:
-        emi = principal * r * (1+r)**n / ((1+r)**n -1)
+    emi = _emi(principal, r, n)
 
     return{
         "emi": round(emi,2),
@@ -24,29 +32,86 @@ def calculate_emi(
         "total_interest": round(emi*n - principal,2)
     }
 
+
+def _amortization_arrays(principal: float, r: float, n: int, emi: float):
+    """
+    Closed-form monthly schedule as NumPy arrays.
+
+    Balance after month k is P(1+r)^k - EMI((1+r)^k - 1)/r, so every
+    column is computed in one pass without a Python loop.
+    """
+    months = np.arange(n + 1)
+    if r == 0:
+        balance = principal - emi * months
+    else:
+        growth = (1 + r) ** months
+        balance = principal * growth - emi * (growth - 1) / r
+    balance = np.maximum(balance, 0.0)
+
+    interest = balance[:-1] * r
+    principal_paid = emi - interest
+    return interest, principal_paid, balance[1:]
+
+
+def _first_month(mask: np.ndarray):
+    """1-based index of the first True entry, or None."""
+    return int(np.argmax(mask)) + 1 if mask.any() else None
+
+
 @safe_tool
 def generate_amortization_schedule(
     principal: float,
     annual_rate: float,
-    years: int
+    years: int,
+    view: str = "yearly"
 ):
+    """
+    Amortization schedule in one of three views:
+
+    - "summary": totals, break-even month (cumulative principal repaid
+      reaches cumulative interest paid) and crossover month (monthly
+      principal first exceeds monthly interest)
+    - "yearly": summary plus per-year interest, principal and closing balance
+    - "columnar": summary plus month-by-month arrays
+    """
+    validate_positive(principal, "principal")
+    validate_positive(annual_rate, "annual_rate")
+
+    if years < 1 or years > MAX_LOAN_YEARS:
+        raise ValueError(f"years must be between 1 and {MAX_LOAN_YEARS}.")
+    if view not in AMORTIZATION_VIEWS:
+        raise ValueError(f"view must be one of {', '.join(AMORTIZATION_VIEWS)}.")
+
     r = annual_rate / 100 / 12
     n = years * 12
-    emi = calculate_emi(principal, annual_rate, years)["data"]["emi"]
+    emi = _emi(principal, r, n)
 
-    balance = principal
-    schedule = []
+    interest, principal_paid, balance = _amortization_arrays(principal, r, n, emi)
 
-    for month in range(1, n + 1):
-        interest = balance * r
-        principal_paid = emi - interest
-        balance -= principal_paid
+    result = {
+        "emi": round(emi, 2),
+        "months": n,
+        "total_payment": round(emi * n, 2),
+        "total_interest": round(float(interest.sum()), 2),
+        "break_even_month": _first_month(
+            np.cumsum(principal_paid) >= np.cumsum(interest)
+        ),
+        "crossover_month": _first_month(principal_paid > interest)
+    }
 
-        schedule.append({
-            "month": month,
-            "interest": round(interest, 2),
-            "principal_paid": round(principal_paid, 2),
-            "remaining_balance": round(max(balance, 0), 2)
-        })
+    if view == "yearly":
+        result["yearly"] = {
+            "year": list(range(1, years + 1)),
+            "interest": np.round(interest.reshape(years, 12).sum(axis=1), 2).tolist(),
+            "principal_paid": np.round(principal_paid.reshape(years, 12).sum(axis=1), 2).tolist(),
+            "closing_balance": np.round(balance[11::12], 2).tolist()
+        }
+    elif view == "columnar":
+        result["schedule"] = {
+            "month": list(range(1, n + 1)),
+            "interest": np.round(interest, 2).tolist(),
+            "principal_paid": np.round(principal_paid, 2).tolist(),
+            "remaining_balance": np.round(balance, 2).tolist()
+        }
 
-    return {"schedule": schedule}
\ No newline at end of file
+    return result
@@ -0,0 +1,122 @@
+import numpy as np
+from utils import validate_positive, safe_tool
+
+MAX_GRID_POINTS = 10_000
+
+
+def _sip_future_value(monthly_investment, annual_return, years):
+    r = annual_return / 100 / 12
+    n = years * 12
+    safe_r = np.where(r == 0, 1.0, r)
+    future_value = np.where(
+        r == 0,
+        monthly_investment * n,
+        monthly_investment * (((1 + safe_r)**n - 1) / safe_r) * (1 + safe_r)
+    )
+    total_invested = monthly_investment * n
+    return {
+        "total_invested": total_invested,
+        "future_value": future_value,
+        "total_gain": future_value - total_invested
+    }
+
+
+def _emi(principal, annual_rate, years):
+    r = annual_rate / 100 / 12
+    n = years * 12
+    safe_r = np.where(r == 0, 1.0, r)
+    emi = np.where(
+        r == 0,
+        principal / n,
+        principal * safe_r * (1 + safe_r)**n / ((1 + safe_r)**n - 1)
+    )
+    return {
+        "emi": emi,
+        "total_payment": emi * n,
+        "total_interest": emi * n - principal
+    }
+
+
+def _required_sip(target_amount, annual_return, years):
+    r = annual_return / 100 / 12
+    n = years * 12
+    safe_r = np.where(r == 0, 1.0, r)
+    sip = np.where(
+        r == 0,
+        target_amount / n,
+        target_amount / ((((1 + safe_r)**n - 1) / safe_r) * (1 + safe_r))
+    )
+    return {"required_monthly_investment": sip}
+
+
+# calculation name -> (closed form, ordered input parameters)
+CALCULATIONS = {
+    "sip_future_value": (_sip_future_value, ("monthly_investment", "annual_return", "years")),
+    "emi": (_emi, ("principal", "annual_rate", "years")),
+    "required_sip": (_required_sip, ("target_amount", "annual_return", "years")),
+}
+
+
+def _expand(name: str, spec) -> np.ndarray:
+    """
+    Turn a parameter spec into a 1-D array of values.
+
+    Accepts a scalar, a list of values, or an inclusive range
+    {"start": 7, "stop": 10, "step": 1}.
+    """
+    if isinstance(spec, dict):
+        try:
+            start, stop, step = spec["start"], spec["stop"], spec.get("step", 1)
+        except KeyError:
+            raise ValueError(f"{name} range needs 'start' and 'stop'.")
+        if step <= 0 or stop < start:
+            raise ValueError(f"{name} range needs step > 0 and stop >= start.")
+        if (stop - start) / step + 1 > MAX_GRID_POINTS:
+            raise ValueError(f"{name} range has more than {MAX_GRID_POINTS} values.")
+        values = np.arange(start, stop + step / 2, step, dtype=float)
+    else:
+        values = np.atleast_1d(np.asarray(spec, dtype=float))
+
+    if values.ndim != 1 or values.size == 0:
+        raise ValueError(f"{name} must be a number, a list or a range.")
+    validate_positive(float(values.min()), name)
+    return values
+
+
+@safe_tool
+def scenario_grid(calculation: str, parameters: dict):
+    """
+    Evaluate a closed-form calculation over the Cartesian product of
+    parameter values in one vectorized pass.
+
+    Returns a compact table: `columns` names the inputs followed by the
+    outputs, and each entry of `rows` is one scenario.
+    """
+    if calculation not in CALCULATIONS:
+        raise ValueError(f"calculation must be one of {', '.join(CALCULATIONS)}.")
+
+    formula, names = CALCULATIONS[calculation]
+
+    missing = [name for name in names if name not in parameters]
+    if missing:
+        raise ValueError(f"Missing parameters: {', '.join(missing)}.")
+
+    axes = [_expand(name, parameters[name]) for name in names]
+    points = int(np.prod([axis.size for axis in axes]))
+    if points > MAX_GRID_POINTS:
+        raise ValueError(f"Grid has {points} scenarios; the limit is {MAX_GRID_POINTS}.")
+
+    grids = [grid.ravel() for grid in np.meshgrid(*axes, indexing="ij")]
+    if "years" in names and grids[names.index("years")].min() <= 0:
+        raise ValueError("years must be positive.")
+
+    outputs = formula(*grids)
+
+    table = np.column_stack(grids + [np.round(values, 2) for values in outputs.values()])
+
+    return {
+        "calculation": calculation,
+        "columns": list(names) + list(outputs),
+        "rows": table.tolist(),
+        "scenarios": points
+    }